@@ -0,0 +1,28 @@
+# compare_dtypes.py
+# Goal: Compare frame precision through image_stream
+#        - bytes per queued frame (and worst case for a full queue)
+#        - end-to-end time per frame (disk -> preprocess -> consumer)
+
+import time
+
+import numpy as np
+
+from pipeline.loader import load_image_paths
+from pipeline.stream import image_stream
+
+IMAGE_DIR = "Data/images"
+QUEUE_SIZE = 4
+
+paths = load_image_paths(IMAGE_DIR)
+
+print(f"{'dtype':<10}{'bytes/frame':>12}{'full queue KB':>15}{'ms/frame':>10}{'FPS':>8}")
+for dtype in (np.float32, np.float16, np.uint8):
+    frames = 0
+    start = time.time()
+    for img in image_stream(paths, queue_size=QUEUE_SIZE, dtype=dtype):
+        frames += 1
+        nbytes = img.nbytes
+    elapsed = time.time() - start
+
+    print(f"{np.dtype(dtype).name:<10}{nbytes:>12}{nbytes * QUEUE_SIZE / 1024:>15.1f}"
+          f"{elapsed / frames * 1000:>10.2f}{frames / elapsed:>8.1f}")
@@ -4,19 +4,36 @@
 #        - preprocessing
 #        - streaming
 #        - system monitoring
+#        - memory budget (governor)
+
+import queue
 
 from pipeline.loader import load_image_paths
-from pipeline.stream import image_stream
+from pipeline.stream import image_stream, resize_queue
 from utils.monitor import system_stats, FPSCounter
+from utils.governor import MemoryGovernor, release_memory
 
 #  Path to your data folder
 IMAGE_DIR = "data/images"
 
+#  Process RSS budget: stay well clear of the ~3.5 GB the board tolerates
+MEMORY_BUDGET_MB = 2048
+QUEUE_SIZE = 4
+
 #  Step 1: Load image paths (no images yet)
 paths = load_image_paths(IMAGE_DIR)
 
 #  Step 2: Create a lazy image generator
-stream = image_stream(paths)
+# (own queue, so the governor can shrink it while streaming)
+frame_queue = queue.Queue(maxsize=QUEUE_SIZE)
+stream = image_stream(paths, q=frame_queue)
+
+#  Degradation steps, mildest first; undone in reverse when pressure falls
+governor = MemoryGovernor(budget_mb=MEMORY_BUDGET_MB, log_path="governor.jsonl")
+governor.add_step("shrink prefetch queue",
+                  apply=lambda: resize_queue(frame_queue, 1),
+                  revert=lambda: resize_queue(frame_queue, QUEUE_SIZE))
+governor.add_step("drop caches", apply=release_memory)
 
 #  Step 3: Setup FPS and memory tracking
 fps = FPSCounter()
@@ -30,6 +47,7 @@ for img in stream:
     # Track performance
     fps_val = fps.update()
     mem = system_stats()
+    governor.check(fps_val)
 
     # Optimization: Reduce print frequency to save I/O overhead
     if fps.frames % 10 == 0:
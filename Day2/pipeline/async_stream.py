@@ -0,0 +1,71 @@
+# async_stream.py
+# Goal: Same lazy, prefetched image stream as stream.py, but as an
+#       async iterator so it can run inside an asyncio service.
+
+import asyncio
+import contextlib
+
+import numpy as np
+
+from pipeline.loader import read_image
+from pipeline.preprocess import preprocess_image
+
+
+_DONE = object()  # End-of-stream marker
+
+
+def _load(path, dtype):
+    # Runs in the executor: disk read + decode + preprocess
+    img = read_image(path)
+    if img is None:
+        return None
+    return preprocess_image(img, dtype=dtype)
+
+
+async def async_image_stream(image_paths, queue_size=4, executor=None, dtype=np.float32):
+    """
+    Async version of image_stream().
+
+    Usage:
+        async for img in async_image_stream(paths):
+            ...
+
+    Optimization:
+    - Read/decode/preprocess runs in an executor, so the event loop
+      stays free for other tasks (control messages, uploads, other pipelines)
+    - Bounded asyncio.Queue gives the same backpressure as stream.py
+    - Breaking out of the loop (or cancelling the task) stops the producer
+    """
+
+    loop = asyncio.get_running_loop()
+    q = asyncio.Queue(maxsize=queue_size)
+
+    async def producer():
+        try:
+            for path in image_paths:
+                img = await loop.run_in_executor(executor, _load, path, dtype)
+
+                # Skip corrupted images
+                if img is None:
+                    continue
+
+                # Waits if queue is full (Backpressure)
+                await q.put(img)
+            await q.put(_DONE)
+        except Exception as e:
+            # Hand the error to the consumer instead of dying silently
+            await q.put(e)
+
+    task = asyncio.create_task(producer())
+    try:
+        while True:
+            item = await q.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
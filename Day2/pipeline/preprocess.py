@@ -8,7 +8,7 @@ import cv2
 import numpy as np
 
 
-def preprocess_image(img, size=(224, 224)):
+def preprocess_image(img, size=(224, 224), dtype=np.float32):
     """
     Preprocess a single image for edge inference.
 
@@ -17,6 +17,11 @@ def preprocess_image(img, size=(224, 224)):
     - Use float32 (not float64)
     - Avoid unnecessary memory copies
 
+    Low-precision transport (model folds /255 + mean/std into its first conv):
+    - dtype=np.uint8:   return the resized image as-is, values 0-255 (1 byte/px)
+    - dtype=np.float16: values 0-255, exact in float16 (2 bytes/px)
+    - dtype=np.float32: values normalized to [0, 1] (default, 4 bytes/px)
+
     Think:
     - Why resize first?
     - Why not normalize uint8 directly?
@@ -28,6 +33,12 @@ def preprocess_image(img, size=(224, 224)):
     # img = ?
     img = cv2.resize(img, size)
 
+    # Low-precision modes stop here: scaling happens inside the model
+    if dtype == np.uint8:
+        return img
+    if dtype == np.float16:
+        return img.astype(np.float16)
+
     # 2: Convert image to float32
     # Hint: NumPy dtype conversion
     # img = ?
@@ -0,0 +1,135 @@
+# governor.py
+# Responsibility: Keep the process under a memory budget.
+# - Watch process RSS (not system-wide "used", which other processes move)
+# - Above the high watermark: apply the next degradation step
+# - Below the low watermark: undo the most recent step
+# - Log every transition with a timestamp (and FPS, if given) so it can
+#   be lined up with throughput afterwards
+#
+# Usage:
+#   governor = MemoryGovernor(budget_mb=1500)
+#   governor.add_step("lower input resolution", apply=..., revert=...)
+#   while True:
+#       ...
+#       governor.check(fps)
+
+import ctypes
+import gc
+import json
+import time
+from datetime import datetime
+
+import psutil
+
+
+def process_rss_mb():
+    """Resident set size of this process in MB."""
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def release_memory():
+    """
+    Drop what Python and the allocator keep around after objects die:
+    collect reference cycles, then ask glibc to hand freed heap pages
+    back to the OS (otherwise RSS never goes down).
+    """
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass  # not glibc (macOS, musl): nothing more to do
+
+
+class MemoryGovernor:
+    def __init__(self, budget_mb, high=0.90, low=0.70, interval=1.0, settle=5.0, log_path=None):
+        """
+        budget_mb: RSS budget for this process
+        high / low: fractions of the budget. Degrade above high, recover
+                    below low; the gap keeps it from flapping.
+        interval: seconds between RSS reads (check() is cheap in between)
+        settle: seconds to wait after a transition before the next one,
+                so the effect of a step shows up in RSS first
+        log_path: optional JSON-lines file, one line per transition
+        """
+        self.budget_mb = budget_mb
+        self.high_mb = budget_mb * high
+        self.low_mb = budget_mb * low
+        self.interval = interval
+        self.settle = settle
+        self.log_path = log_path
+
+        self.steps = []        # (name, apply, revert), mildest first
+        self.level = 0         # number of steps currently applied
+        self.transitions = []  # every transition, oldest first
+        self.rss_mb = 0.0
+        self._last_check = 0.0
+        self._last_change = 0.0
+
+    def add_step(self, name, apply, revert=None):
+        """
+        Register the next degradation step (call in the order they should
+        apply). revert=None for steps that need no undo (e.g. freeing caches).
+        """
+        self.steps.append((name, apply, revert))
+        return self
+
+    def check(self, fps=None):
+        """
+        Call once per loop iteration. Applies or reverts at most one step.
+        Returns the current level (0 = nothing degraded).
+        """
+        now = time.monotonic()
+        if now - self._last_check < self.interval:
+            return self.level
+        self._last_check = now
+        self.rss_mb = process_rss_mb()
+
+        if now - self._last_change < self.settle:
+            return self.level
+
+        if self.rss_mb > self.high_mb and self.level < len(self.steps):
+            name, apply, _ = self.steps[self.level]
+            if self._run(apply, "degrade", name, fps):
+                self.level += 1
+                self._log("degrade", name, fps)
+            self._last_change = time.monotonic()
+        elif self.rss_mb < self.low_mb and self.level > 0:
+            name, _, revert = self.steps[self.level - 1]
+            if revert is None or self._run(revert, "recover", name, fps):
+                self.level -= 1
+                self._log("recover", name, fps)
+            self._last_change = time.monotonic()
+        return self.level
+
+    def _run(self, fn, action, step, fps):
+        """
+        A relief step must never take the pipeline down: a failing step
+        is logged and the level stays put (retried after `settle`).
+        """
+        try:
+            fn()
+            return True
+        except Exception as e:
+            self._log(f"{action} failed", step, fps, error=repr(e))
+            return False
+
+    def _log(self, action, step, fps, error=None):
+        entry = {
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "action": action,
+            "step": step,
+            "level": self.level,
+            "rss_mb": round(self.rss_mb, 1),
+            "budget_mb": self.budget_mb,
+            "fps": None if fps is None else round(fps, 2),
+        }
+        if error is not None:
+            entry["error"] = error
+        self.transitions.append(entry)
+        fps_text = "" if fps is None else f" | FPS: {fps:.2f}"
+        print(f"[GOVERNOR] {entry['time']} {action} -> level {self.level}/{len(self.steps)} "
+              f"'{step}' | RSS: {self.rss_mb:.0f}/{self.budget_mb:.0f} MB{fps_text}"
+              + ("" if error is None else f" | {error}"))
+        if self.log_path:
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
@@ -0,0 +1,52 @@
+# benchmark_e2e.py
+# Runs the end-to-end benchmark (bench.py) of every pipeline on the same
+# frames - no camera needed - and prints one comparison table.
+# Each pipeline runs in its own process (they share module names, and
+# RSS should not mix).
+#
+# Usage:
+#   python benchmark_e2e.py                                  # synthetic frames
+#   python benchmark_e2e.py --source clip.rec:fast --frames 300 --fps 0
+#
+# Record a clip first with: python edge_mobilenent_pipeline/record.py clip.rec
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PIPELINES = ["edge_camera_pipeline", "edge_mobilenent_pipeline"]
+
+parser = argparse.ArgumentParser(description="End-to-end benchmark of all pipelines")
+parser.add_argument("--source", default="synthetic:0",
+                    help="recording (.rec[:fast|:N]), video file or 'synthetic[:fps]'")
+parser.add_argument("--frames", type=int, default=300)
+parser.add_argument("--fps", type=float, default=0, help="sampler target FPS (0 = every frame)")
+parser.add_argument("--pipelines", nargs="+", default=PIPELINES, choices=PIPELINES)
+args = parser.parse_args()
+
+# bench.py runs inside each pipeline folder: make file paths absolute
+source = args.source
+match = re.match(r"^(.*?)(:fast|:[\d.]+)?$", source)
+if match and os.path.exists(match.group(1)):
+    source = os.path.abspath(match.group(1)) + (match.group(2) or "")
+
+rows = []
+for name in args.pipelines:
+    print(f"[INFO] Benchmarking {name}...")
+    proc = subprocess.run(
+        [sys.executable, "bench.py", "--source", source, "--frames", str(args.frames),
+         "--fps", str(args.fps), "--json"],
+        cwd=os.path.join(ROOT, name), capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(f"[ERROR] {name} failed:\n{proc.stderr.strip()}")
+        continue
+    rows.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+print(f"\n{'Pipeline':<28}{'Frames':>8}{'FPS':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'RSS MB':>9}")
+for r in rows:
+    print(f"{r['pipeline']:<28}{r['frames']:>8}{r['fps']:>9.2f}{r['p50_ms']:>9.1f}"
+          f"{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['peak_rss_mb']:>9.1f}")
@@ -0,0 +1,273 @@
+# benchmark_micro.py
+# Micro-benchmarks for the non-model code, with a stored baseline so
+# optimisations don't silently rot:
+#   Day2:                     load_image_paths, read_image, preprocess_image,
+#                             image_stream (several queue sizes)
+#   edge_camera_pipeline:     preprocess, FrameSampler.allow
+#   edge_mobilenent_pipeline: preprocess, FrameSampler.allow
+#
+# Fixtures are generated JPEGs of several sizes (on disk, for the loaders)
+# and the same frames in memory (for preprocess). Each case reports
+# throughput, per-call latency percentiles and the tracemalloc peak.
+# Each pipeline runs in its own process (they share module names).
+#
+# Usage:
+#   python benchmark_micro.py --update-baseline    # record on this box
+#   python benchmark_micro.py                      # compare; exit 1 on regression
+#   python benchmark_micro.py --tolerance 0.5 --only preprocess
+#
+# Baselines are per machine: record them on the box you compare on.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PROJECTS = ["Day2", "edge_camera_pipeline", "edge_mobilenent_pipeline"]
+SIZES = [(320, 240), (640, 480), (1280, 720), (1920, 1080)]
+QUEUE_SIZES = [1, 2, 4, 8]
+
+
+def make_fixtures(folder, per_size=10, seed=0):
+    """JPEGs of every size in SIZES: gradient + noise, like a camera frame."""
+    rng = np.random.default_rng(seed)
+    for w, h in SIZES:
+        x = np.linspace(0, 255, w, dtype=np.float32)
+        y = np.linspace(0, 255, h, dtype=np.float32)[:, None]
+        base = np.stack([np.broadcast_to(x, (h, w)), np.broadcast_to(y, (h, w)), (x + y) / 2], axis=2)
+        for i in range(per_size):
+            noise = rng.normal(0, 12, size=(h, w, 3)).astype(np.float32)
+            img = np.clip(base + noise, 0, 255).astype(np.uint8)
+            cv2.imwrite(os.path.join(folder, f"{w}x{h}_{i}.jpg"), img, [cv2.IMWRITE_JPEG_QUALITY, 90])
+
+
+def fixture_paths(folder, size):
+    w, h = size
+    return sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.startswith(f"{w}x{h}_"))
+
+
+def bench(fn, calls, batch=1, alloc_calls=10):
+    """
+    Time `calls` calls of fn() in blocks of `batch` (batch > 1 for
+    sub-microsecond functions, where the timer would dominate), then
+    measure the tracemalloc peak of one call.
+    """
+    for _ in range(min(3, calls)):  # warm-up
+        fn()
+
+    per_call = []
+    start = time.perf_counter()
+    for _ in range(max(1, calls // batch)):
+        t0 = time.perf_counter_ns()
+        for _ in range(batch):
+            fn()
+        per_call.append((time.perf_counter_ns() - t0) / batch / 1000)
+    elapsed = time.perf_counter() - start
+
+    # Separate pass: tracing slows every allocation down
+    tracemalloc.start()
+    peak = 0
+    for _ in range(alloc_calls):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    lat = np.array(per_call)
+    return {
+        "calls": len(per_call) * batch,
+        "ops_per_s": len(per_call) * batch / elapsed,
+        "p50_us": float(np.percentile(lat, 50)),
+        "p95_us": float(np.percentile(lat, 95)),
+        "p99_us": float(np.percentile(lat, 99)),
+        "peak_kb": peak / 1024,
+    }
+
+
+def cycle(items):
+    """fn() that walks through items, one per call."""
+    state = {"i": 0}
+
+    def next_item():
+        item = items[state["i"] % len(items)]
+        state["i"] += 1
+        return item
+    return next_item
+
+
+def bench_preprocess(results, name, fn, fixtures, calls):
+    for size in SIZES:
+        frames = [cv2.imread(p) for p in fixture_paths(fixtures, size)]
+        frame = cycle(frames)
+        results[f"{name}[{size[0]}x{size[1]}]"] = bench(lambda: fn(frame()), calls)
+
+
+def bench_sampler(results, name, FrameSampler, calls):
+    for fps in (0, 30):
+        sampler = FrameSampler(target_fps=fps)
+        results[f"{name}[fps={fps}]"] = bench(sampler.allow, calls * 100, batch=100)
+
+
+def cases_day2(fixtures, calls):
+    from pipeline.loader import load_image_paths, read_image
+    from pipeline.preprocess import preprocess_image
+    from pipeline.stream import image_stream
+
+    results = {"Day2/load_image_paths": bench(lambda: load_image_paths(fixtures), calls)}
+    for size in SIZES:
+        path = cycle(fixture_paths(fixtures, size))
+        results[f"Day2/read_image[{size[0]}x{size[1]}]"] = bench(lambda: read_image(path()), calls)
+    bench_preprocess(results, "Day2/preprocess_image", preprocess_image, fixtures, calls)
+
+    # Whole stream over every fixture: latency = consumer wait per image,
+    # peak = everything in flight (grows with queue_size)
+    paths = load_image_paths(fixtures)
+    for queue_size in QUEUE_SIZES:
+        waits = []
+        start = time.perf_counter()
+        t0 = time.perf_counter_ns()
+        for _ in image_stream(paths, queue_size=queue_size):
+            waits.append((time.perf_counter_ns() - t0) / 1000)
+            t0 = time.perf_counter_ns()
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        for _ in image_stream(paths, queue_size=queue_size):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        lat = np.array(waits)
+        results[f"Day2/image_stream[queue={queue_size}]"] = {
+            "calls": len(waits),
+            "ops_per_s": len(waits) / elapsed,
+            "p50_us": float(np.percentile(lat, 50)),
+            "p95_us": float(np.percentile(lat, 95)),
+            "p99_us": float(np.percentile(lat, 99)),
+            "peak_kb": peak / 1024,
+        }
+    return results
+
+
+def cases_camera(fixtures, calls):
+    from pipeline.preprocess import preprocess
+    from pipeline.sampler import FrameSampler
+
+    results = {}
+    bench_preprocess(results, "edge_camera/preprocess", preprocess, fixtures, calls)
+    bench_sampler(results, "edge_camera/FrameSampler.allow", FrameSampler, calls)
+    return results
+
+
+def cases_mobilenet(fixtures, calls):
+    from pipeline.preprocess import preprocess
+    from pipeline.sampler import FrameSampler
+
+    results = {}
+    bench_preprocess(results, "edge_mobilenet/preprocess", preprocess, fixtures, calls)
+    bench_sampler(results, "edge_mobilenet/FrameSampler.allow", FrameSampler, calls)
+    return results
+
+
+WORKERS = {
+    "Day2": cases_day2,
+    "edge_camera_pipeline": cases_camera,
+    "edge_mobilenent_pipeline": cases_mobilenet,
+}
+
+
+def compare(name, result, base, tolerance, alloc_tolerance):
+    """Regressions of one case vs. its baseline, as readable strings."""
+    problems = []
+    if result["p50_us"] > base["p50_us"] * (1 + tolerance):
+        problems.append(f"p50 {base['p50_us']:.1f} -> {result['p50_us']:.1f} us")
+    if result["ops_per_s"] < base["ops_per_s"] / (1 + tolerance):
+        problems.append(f"throughput {base['ops_per_s']:.0f} -> {result['ops_per_s']:.0f} ops/s")
+    # +4 KB slack: tiny cases jitter by a few allocator blocks
+    if result["peak_kb"] > base["peak_kb"] * (1 + alloc_tolerance) + 4:
+        problems.append(f"peak {base['peak_kb']:.0f} -> {result['peak_kb']:.0f} KB")
+    return [f"{name}: {p}" for p in problems]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for loading, preprocessing and sampling")
+    parser.add_argument("--calls", type=int, default=200, help="timed calls per case")
+    parser.add_argument("--baseline", default=os.path.join(ROOT, "benchmark_baseline.json"))
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.30,
+                        help="allowed slowdown of p50 / throughput (0.30 = 30%%)")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.10,
+                        help="allowed growth of the allocation peak")
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--projects", nargs="+", default=PROJECTS, choices=PROJECTS)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)    # internal: project name
+    parser.add_argument("--fixtures", help=argparse.SUPPRESS)  # internal: fixture folder
+    args = parser.parse_args()
+
+    if args.worker:
+        sys.path.insert(0, os.getcwd())
+        print(json.dumps(WORKERS[args.worker](args.fixtures, args.calls)))
+        sys.exit(0)
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_fixtures_") as fixtures:
+        make_fixtures(fixtures)
+        for project in args.projects:
+            print(f"[INFO] Benchmarking {project}...")
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", project,
+                 "--fixtures", fixtures, "--calls", str(args.calls)],
+                cwd=os.path.join(ROOT, project), capture_output=True, text=True)
+            if proc.returncode != 0:
+                sys.exit(f"[ERROR] {project} failed:\n{proc.stderr.strip()}")
+            results.update(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    if args.only:
+        results = {k: v for k, v in results.items() if args.only in k}
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        if stored.get("host") != platform.node():
+            print(f"[WARN] Baseline was recorded on {stored.get('host')!r}, this is {platform.node()!r}")
+        baseline = stored["results"]
+
+    print(f"\n{'Case':<48}{'ops/s':>11}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'peak KB':>10}{'vs base':>9}")
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        change = f"{r['p50_us'] / base['p50_us'] - 1:+.0%}" if base else "new"
+        print(f"{name:<48}{r['ops_per_s']:>11.0f}{r['p50_us']:>10.1f}{r['p95_us']:>10.1f}"
+              f"{r['p99_us']:>10.1f}{r['peak_kb']:>10.0f}{change:>9}")
+        if base:
+            regressions += compare(name, r, base, args.tolerance, args.alloc_tolerance)
+
+    if args.update_baseline:
+        if os.path.exists(args.baseline):
+            # Keep cases this run skipped (--only / --projects)
+            with open(args.baseline) as f:
+                results = {**json.load(f)["results"], **results}
+        with open(args.baseline, "w") as f:
+            json.dump({"host": platform.node(), "python": platform.python_version(),
+                       "results": results}, f, indent=2)
+        print(f"\n[INFO] Baseline saved to {args.baseline}")
+    elif not baseline:
+        print(f"\n[WARN] No baseline at {args.baseline}; run with --update-baseline first")
+    elif regressions:
+        print(f"\n[FAIL] {len(regressions)} regression(s) beyond tolerance:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    else:
+        print("\n[OK] No regressions beyond tolerance")
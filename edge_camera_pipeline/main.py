@@ -5,17 +5,23 @@
 # - Preprocess each frame
 # - Simulate model inference
 # - Track performance
+#
+# Usage: python main.py [source]
+#   source: camera id (default 0), recording (clip.rec[:fast|:N]),
+#           video file or 'synthetic' - see camera/sources.py
 
 from camera.webcam import Webcam
+from camera.sources import open_source
 from pipeline.sampler import FrameSampler
 from pipeline.preprocess import preprocess
 from inference.dummy_model import dummy_inference
 from utils.metrics import Monitor
 import time
+import sys
 
 
 #  Initialize modules
-cam = Webcam()
+cam = open_source(sys.argv[1]) if len(sys.argv) > 1 else Webcam()
 sampler = FrameSampler(target_fps=5)
 monitor = Monitor()
 monitor.start = time.time()  # STUDENTS MUST DO THIS
@@ -7,7 +7,7 @@ import cv2
 import numpy as np
 
 
-def preprocess(frame, size=(224, 224)):
+def preprocess(frame, size=(224, 224), dtype=np.float32):
     """
     Resize and normalize image for model input.
 
@@ -17,6 +17,10 @@ def preprocess(frame, size=(224, 224)):
     - Resize FIRST, then normalize
     - Keep dimensions consistent (HxWxC → CHW if needed)
 
+    Low-precision transport (model does the scaling itself):
+    - dtype=np.uint8:   resized frame, values 0-255
+    - dtype=np.float16: values 0-255 (exact in float16)
+
     Think:
     - Why float32 and not uint8?
     - Why resize before normalization?
@@ -29,6 +33,12 @@ def preprocess(frame, size=(224, 224)):
     # Use OpenCV resize
     resized = cv2.resize(frame, size)
 
+    # Low-precision modes: skip normalization here
+    if dtype == np.uint8:
+        return resized
+    if dtype == np.float16:
+        return resized.astype(np.float16)
+
     # 2: Convert to float32
     # 3: Normalize pixels to range [0, 1]
     # In-place normalization to save memory
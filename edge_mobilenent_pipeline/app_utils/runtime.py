@@ -0,0 +1,144 @@
+# app_utils/runtime.py
+# Responsibility: Decide which cores each pipeline stage runs on and
+# size every library's thread pool to match, so torch, OpenCV and our
+# own threads don't fight over the same cores. Also carries the
+# pipeline settings picked by autotune.py (model variant, input size,
+# sample rate, frame queue size) and the negotiated camera mode.
+
+import json
+import os
+import threading
+
+import cv2
+import torch
+
+STAGES = ("capture", "preprocess", "inference")
+THREAD_FIELDS = ("torch_threads", "interop_threads", "cv2_threads")
+PIPELINE_FIELDS = ("model", "input_size", "target_fps", "queue_size", "camera")
+
+
+def available_cores():
+    """Cores this process may run on (respects taskset / cgroups)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def pin_thread(cores):
+    """
+    Restrict the CALLING thread to `cores` (Linux only, no-op elsewhere).
+    Threads started afterwards from this thread (e.g. torch's OpenMP pool)
+    inherit the mask.
+    """
+    if not cores or not hasattr(os, "sched_setaffinity"):
+        return False
+    # On Linux a thread id works as a pid here and affects only that thread
+    os.sched_setaffinity(threading.get_native_id(), cores)
+    return True
+
+
+class RuntimeConfig:
+    def __init__(self, capture=None, preprocess=None, inference=None,
+                 torch_threads=None, interop_threads=None, cv2_threads=None,
+                 model="fp32", input_size=(224, 224), target_fps=5, queue_size=2, camera=None):
+        """
+        capture / preprocess / inference: list of core ids per stage
+                                          (None = don't pin)
+        torch_threads:   torch intra-op threads (None = len(inference cores))
+        interop_threads: torch inter-op threads (None = leave default)
+        cv2_threads:     OpenCV pool size (None = len(preprocess cores))
+        model:           MobileNet variant, see inference.mobilenet.MODEL_VARIANTS
+        input_size:      (width, height) frames are resized to
+        target_fps:      FrameSampler rate (0 = every frame)
+        queue_size:      frames buffered between capture and inference
+        camera:          saved Webcam.mode() ({"fourcc", "width", "height"}),
+                         None = negotiate on first start
+        """
+        self.cores = {"capture": capture, "preprocess": preprocess, "inference": inference}
+        self.torch_threads = torch_threads
+        self.interop_threads = interop_threads
+        self.cv2_threads = cv2_threads
+        self.model = model
+        self.input_size = tuple(input_size)
+        self.target_fps = target_fps
+        self.queue_size = queue_size
+        self.camera = camera
+        self.path = None  # file this was loaded from (save() writes back there)
+
+    @classmethod
+    def auto(cls, cores=None):
+        """
+        Default split:
+        - 1 core:  everything shares it, single-threaded libraries
+        - 2 cores: capture + preprocess on one, inference on the other
+        - 3+:      capture and preprocess one core each, inference gets the rest
+        """
+        cores = cores or available_cores()
+        if len(cores) == 1:
+            return cls(cores, cores, cores, torch_threads=1, interop_threads=1, cv2_threads=1)
+        if len(cores) == 2:
+            return cls(cores[:1], cores[:1], cores[1:], interop_threads=1, cv2_threads=1)
+        return cls(cores[:1], cores[1:2], cores[2:], interop_threads=1, cv2_threads=1)
+
+    @classmethod
+    def load(cls, path="runtime.json"):
+        """
+        Load from JSON; falls back to auto() if the file doesn't exist.
+        Missing keys keep their defaults (older files have no pipeline settings).
+        """
+        if not os.path.exists(path):
+            # Also look next to the entry scripts (one level above app_utils/)
+            project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            path = os.path.join(project_dir, path)
+        if not os.path.exists(path):
+            return cls.auto()
+        with open(path) as f:
+            data = json.load(f)
+        allowed = set(available_cores())
+        for stage in STAGES:
+            # Ignore cores that don't exist on this box
+            if data.get(stage) is not None:
+                data[stage] = [c for c in data[stage] if c in allowed] or None
+        config = cls(**{k: data[k] for k in STAGES + THREAD_FIELDS + PIPELINE_FIELDS if k in data})
+        config.path = path
+        return config
+
+    def to_dict(self):
+        d = dict(self.cores)
+        d.update(torch_threads=self.torch_threads, interop_threads=self.interop_threads,
+                 cv2_threads=self.cv2_threads, model=self.model,
+                 input_size=list(self.input_size), target_fps=self.target_fps,
+                 queue_size=self.queue_size, camera=self.camera)
+        return d
+
+    def save(self, path=None):
+        """Write to `path`, else back to the loaded file, else ./runtime.json."""
+        with open(path or self.path or "runtime.json", "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def apply_libraries(self):
+        """
+        Size torch and OpenCV thread pools. Call once at startup,
+        before the first inference (torch's inter-op pool can only be
+        sized before it starts).
+        """
+        torch_threads = self.torch_threads or len(self.cores["inference"] or available_cores())
+        torch.set_num_threads(torch_threads)
+        if self.interop_threads:
+            try:
+                torch.set_num_interop_threads(self.interop_threads)
+            except RuntimeError:
+                print("[WARN] torch inter-op threads already started; setting ignored")
+
+        cv2_threads = self.cv2_threads or len(self.cores["preprocess"] or available_cores())
+        cv2.setNumThreads(cv2_threads)
+
+    def enter(self, *stages):
+        """Pin the calling thread to the union of the given stages' cores."""
+        cores = set()
+        for stage in stages:
+            cores.update(self.cores[stage] or [])
+        return pin_thread(sorted(cores))
+
+    def __str__(self):
+        return ", ".join(f"{k}={v}" for k, v in self.to_dict().items())
@@ -0,0 +1,163 @@
+# app_utils/tracing.py
+# Responsibility: Opt-in per-frame timeline (capture, sample, preprocess,
+# inference, post-process, queue waits) exported as Chrome trace-event
+# JSON - open it in chrome://tracing or https://ui.perfetto.dev.
+#
+# Disabled by default: span() then returns a shared no-op context
+# manager, so leaving the calls in the hot loop costs about a
+# microsecond each (vs. tens of milliseconds per frame).
+#
+# Enable from the environment:
+#   EDGE_TRACE=trace.json python main.py          # our spans
+#   EDGE_TRACE=trace.json EDGE_TRACE_TORCH=1 ...  # + torch operator spans
+#
+# Torch operators are only recorded for a bounded window of frames
+# (torch_frames, after a few warm-up frames); loops mark frame
+# boundaries with tracer.step().
+
+import atexit
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+
+_NULL = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.tracer.events.append((self.name, threading.get_native_id(), self.start, end - self.start, self.args))
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.events = None
+        self.profiler = None
+        self.torch_events = []
+        self.path = None
+        # perf_counter -> wall clock, so our spans line up with torch's
+        self.offset_ns = time.time_ns() - time.perf_counter_ns()
+
+    def enable(self, path="trace.json", capacity=100000, torch_profiler=False, dump_at_exit=True,
+               torch_frames=50, torch_skip=5):
+        """
+        Start recording into a ring buffer of `capacity` spans
+        (oldest spans are dropped once it is full).
+        torch_profiler: also record torch operators (heavier; for diagnosis only)
+                        for `torch_frames` frames after skipping `torch_skip`,
+                        so its memory stays bounded too
+        """
+        self.events = collections.deque(maxlen=capacity)
+        self.path = path
+        self.enabled = True
+        if torch_profiler:
+            from torch.profiler import profile, schedule, ProfilerActivity
+            self.profiler = profile(
+                activities=[ProfilerActivity.CPU],
+                schedule=schedule(wait=max(torch_skip - 1, 0), warmup=1, active=torch_frames, repeat=1),
+                on_trace_ready=self._collect_torch)
+            self.profiler.__enter__()
+        if dump_at_exit:
+            atexit.register(self.dump)
+
+    def enable_from_env(self, suffix="", dump_at_exit=True):
+        """
+        Enable if EDGE_TRACE is set. suffix keeps per-process files apart.
+        Returns the trace path, or None when tracing stays off.
+        """
+        path = os.environ.get("EDGE_TRACE")
+        if path:
+            if suffix:
+                root, ext = os.path.splitext(path)
+                path = f"{root}.{suffix}{ext or '.json'}"
+            self.enable(path, torch_profiler=os.environ.get("EDGE_TRACE_TORCH") == "1",
+                        dump_at_exit=dump_at_exit)
+        return self.path if self.enabled else None
+
+    def step(self):
+        """Mark a frame boundary (advances the torch profiler window)."""
+        if self.profiler is not None:
+            self.profiler.step()
+
+    def span(self, name, **args):
+        """with tracer.span("inference", frame=n): ..."""
+        if not self.enabled:
+            return _NULL
+        return _Span(self, name, args)
+
+    def _torch_events(self):
+        if self.profiler is not None:
+            # Window still open: stopping it hands over what it has
+            profiler, self.profiler = self.profiler, None
+            profiler.__exit__(None, None, None)
+        return self.torch_events
+
+    def _collect_torch(self, profiler):
+        # on_trace_ready: called once, when the recording window closes
+        import tempfile
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+            tmp = f.name
+        try:
+            profiler.export_chrome_trace(tmp)
+            with open(tmp) as f:
+                data = json.load(f)
+        finally:
+            os.remove(tmp)
+
+        # torch timestamps are microseconds relative to baseTimeNanoseconds
+        base_us = data.get("baseTimeNanoseconds", 0) / 1000
+        for e in data.get("traceEvents", []):
+            if e.get("ph") == "X" and "ts" in e:
+                e = dict(e)
+                e["ts"] = float(e["ts"]) + base_us
+                e["cat"] = "torch"
+                self.torch_events.append(e)
+
+    def dump(self, path=None):
+        """Write everything recorded so far as Chrome trace-event JSON."""
+        if not self.enabled:
+            return None
+        path = path or self.path
+        pid = os.getpid()
+        events = [{
+            "name": name, "ph": "X", "cat": "pipeline", "pid": pid, "tid": tid,
+            "ts": (start + self.offset_ns) / 1000, "dur": dur / 1000, "args": args,
+        } for name, tid, start, dur, args in list(self.events)]
+        events.extend(self._torch_events())
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"[INFO] Trace written to {path} ({len(events)} events)")
+        return path
+
+
+def merge_traces(paths, out_path):
+    """Concatenate several trace files (e.g. one per process) into one."""
+    events = []
+    for p in paths:
+        if os.path.exists(p):
+            with open(p) as f:
+                events.extend(json.load(f)["traceEvents"])
+    with open(out_path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return out_path
+
+
+# Process-wide tracer, shared by every module
+tracer = Tracer()
@@ -0,0 +1,169 @@
+# autotune.py
+# Pick the pipeline settings for THIS box: MobileNet variant, input size,
+# frame queue size and FrameSampler rate. The winner is the
+# highest-rate configuration that meets the p95 latency SLO, the drop
+# SLO and the top-1 agreement SLO (vs. fp32 at 224x224).
+# Saved into runtime.json next to the thread settings from
+# autotune_threads.py; the main*.py entry points load it at startup.
+#
+# Per variant + input size:
+# 1. Capacity pass: every frame, as fast as possible -> max throughput
+#    and top-1 agreement
+# 2. Paced passes: for each queue size, frames arrive at each candidate
+#    rate the capacity allows (highest first, like a camera behind the
+#    sampler); a full queue drops the frame. Capture-to-result p95 and
+#    drops are measured at exactly the rate that would be configured.
+#
+# Usage:
+#   python autotune.py --p95-ms 150 --min-agreement 0.9
+#   python autotune.py --source clip.rec --frames 200   # real footage
+#
+# Run autotune_threads.py first: thread pools are sized from runtime.json.
+
+import argparse
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+import torch
+
+from camera.sources import open_source
+from pipeline.preprocess import preprocess
+from inference.mobilenet import MODEL_VARIANTS, load_variant
+from app_utils.runtime import RuntimeConfig
+
+parser = argparse.ArgumentParser(description="Autotune model variant, input size, queue and sample rate")
+parser.add_argument("--p95-ms", type=float, default=200, help="p95 capture-to-result latency SLO")
+parser.add_argument("--min-agreement", type=float, default=0.9,
+                    help="minimum top-1 agreement with fp32 @ 224x224 (0-1)")
+parser.add_argument("--max-drops", type=float, default=0.05,
+                    help="maximum fraction of frames dropped at the chosen rate")
+parser.add_argument("--source", default="synthetic:0",
+                    help="recording (.rec), video file or 'synthetic' - real footage gives meaningful agreement")
+parser.add_argument("--frames", type=int, default=100, help="frames in the capacity pass")
+parser.add_argument("--seconds", type=float, default=3.0, help="duration of each paced pass")
+parser.add_argument("--variants", nargs="+", default=list(MODEL_VARIANTS), choices=MODEL_VARIANTS)
+parser.add_argument("--sizes", nargs="+", type=int, default=[224, 192, 160, 128], help="square input sizes")
+parser.add_argument("--queue-sizes", nargs="+", type=int, default=[1, 2, 4])
+parser.add_argument("--rates", nargs="+", type=float, default=[30, 15, 10, 5], help="candidate target FPS")
+parser.add_argument("--output", default="runtime.json")
+args = parser.parse_args()
+
+device = "cuda" if torch.cuda.is_available() else "cpu"
+runtime = RuntimeConfig.load(args.output)
+runtime.apply_libraries()
+runtime.enter("preprocess", "inference")
+
+if args.source.startswith("synthetic"):
+    print("[WARN] Synthetic frames: agreement is only indicative, use --source with real footage")
+cam = open_source(args.source, loop=True)
+frames = [cam.read() for _ in range(args.frames)]
+cam.release()
+
+
+def run(model, size, queue_size, rate=None, seconds=None):
+    """
+    Capture thread -> bounded queue -> preprocess + predict.
+    rate=None: every frame once, as fast as possible (the queue blocks).
+    rate=N:    N frames/s for `seconds`; a full queue drops the frame.
+    Returns (top-1 per processed frame, latencies ms, processed/s, dropped, offered).
+    """
+    q = queue.Queue(maxsize=queue_size)
+    counts = {"dropped": 0, "offered": 0}
+
+    def producer():
+        runtime.enter("capture")
+        if rate is None:
+            for frame in frames:
+                # Blocks if queue is full (Backpressure)
+                q.put((time.perf_counter(), frame))
+        else:
+            start = time.perf_counter()
+            i = 0
+            while time.perf_counter() - start < seconds:
+                wait = start + i / rate - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+                counts["offered"] += 1
+                try:
+                    q.put_nowait((time.perf_counter(), frames[i % len(frames)]))
+                except queue.Full:
+                    counts["dropped"] += 1  # live source: model is behind
+                i += 1
+        q.put(None)
+
+    t = threading.Thread(target=producer, daemon=True)
+    t.start()
+
+    tops, latencies = [], []
+    start = time.perf_counter()
+    while True:
+        item = q.get()
+        if item is None:
+            break
+        captured, frame = item
+        probs = model.predict(preprocess(frame, size))
+        tops.append(probs.argmax().item())
+        latencies.append((time.perf_counter() - captured) * 1000)
+    elapsed = time.perf_counter() - start
+    t.join()
+    return tops, np.array(latencies), len(tops) / elapsed, counts["dropped"], counts["offered"]
+
+
+reference = None
+results = []
+print(f"{'Model':<8}{'Size':>6}{'Cap FPS':>9}{'Agree':>8}{'Queue':>7}{'Rate':>7}"
+      f"{'p50 ms':>9}{'p95 ms':>9}{'Drops':>8}  SLO")
+for variant in args.variants:
+    model = load_variant(variant, device)
+    if reference is None:
+        # fp32 @ 224 is the accuracy reference (loaded separately if not a candidate)
+        ref_model = model if variant == "fp32" else load_variant("fp32", device)
+        reference = [ref_model.predict(preprocess(f, (224, 224))).argmax().item() for f in frames]
+        del ref_model
+
+    for side in args.sizes:
+        size = (side, side)
+        for img in frames[:5]:  # warm-up (and per-size conv setup)
+            model.predict(preprocess(img, size))
+
+        # 1. Capacity + agreement (the queue size doesn't matter here)
+        tops, _, capacity, _, _ = run(model, size, 1)
+        agree = float(np.mean([a == b for a, b in zip(tops, reference)]))
+        if agree < args.min_agreement:
+            print(f"{variant:<8}{side:>6}{capacity:>9.1f}{agree:>8.1%}  (below agreement SLO, skipped)")
+            continue
+
+        # 2. Paced at each rate the capacity allows, highest first;
+        #    the first rate that meets the SLOs is this queue size's best
+        for queue_size in args.queue_sizes:
+            for rate in sorted((r for r in args.rates if 0 < r <= capacity), reverse=True):
+                _, lat, _, dropped, offered = run(model, size, queue_size, rate, args.seconds)
+                p50, p95 = float(np.percentile(lat, 50)), float(np.percentile(lat, 95))
+                drops = dropped / offered if offered else 1.0
+                ok = p95 <= args.p95_ms and drops <= args.max_drops
+                print(f"{variant:<8}{side:>6}{capacity:>9.1f}{agree:>8.1%}{queue_size:>7}{rate:>7g}"
+                      f"{p50:>9.1f}{p95:>9.1f}{drops:>8.1%}  {'ok' if ok else '-'}")
+                if ok:
+                    results.append({"model": variant, "input_size": size, "queue_size": queue_size,
+                                    "rate": rate, "p95": p95, "drops": drops, "agree": agree})
+                    break
+    del model
+
+if not results:
+    sys.exit(f"[ERROR] No configuration meets p95 <= {args.p95_ms} ms, drops <= {args.max_drops:.0%} "
+             f"and agreement >= {args.min_agreement:.0%}; {args.output} left unchanged")
+
+# Highest rate; then the most accurate; then the lowest p95; then fewest drops
+best = max(results, key=lambda r: (r["rate"], r["agree"], -r["p95"], -r["drops"]))
+runtime.model = best["model"]
+runtime.input_size = best["input_size"]
+runtime.target_fps = best["rate"]
+runtime.queue_size = best["queue_size"]
+runtime.save(args.output)
+print(f"\n[INFO] Best: {best['model']} @ {best['input_size'][0]}, queue {best['queue_size']}, "
+      f"{best['rate']:g} FPS (p95 {best['p95']:.1f} ms, drops {best['drops']:.1%}, "
+      f"agreement {best['agree']:.1%})")
+print(f"[INFO] Saved to {args.output}")
@@ -0,0 +1,93 @@
+# bench.py
+# End-to-end benchmark of the main.py pipeline without a camera:
+# replay a recording (or synthetic frames) through
+# sample -> scene gate -> preprocess -> MobileNet and report
+# FPS, capture-to-result latency percentiles and RSS.
+#
+# Usage:
+#   python bench.py --source clip.rec:fast --frames 300
+#   python bench.py --source synthetic:0 --fps 0 --json
+
+import argparse
+import json
+import time
+
+import numpy as np
+import psutil
+
+from camera.sources import open_source
+from pipeline.sampler import FrameSampler
+from pipeline.preprocess import preprocess
+from pipeline.scene_gate import SceneChangeGate
+from inference.mobilenet import load_variant
+from app_utils.labels import load_labels
+from app_utils.runtime import RuntimeConfig
+import torch
+
+parser = argparse.ArgumentParser(description="End-to-end MobileNet pipeline benchmark")
+parser.add_argument("--source", default="synthetic:0",
+                    help="recording (.rec[:fast|:N]), video file or 'synthetic[:fps]'")
+parser.add_argument("--frames", type=int, default=300, help="processed frames to measure")
+parser.add_argument("--fps", type=float, default=5, help="sampler target FPS (0 = every frame)")
+parser.add_argument("--no-gate", action="store_true", help="disable the scene-change gate")
+parser.add_argument("--json", action="store_true", help="print one JSON line (for scripts)")
+args = parser.parse_args()
+
+device = "cuda" if torch.cuda.is_available() else "cpu"
+runtime = RuntimeConfig.load()
+runtime.apply_libraries()
+runtime.enter("capture", "preprocess", "inference")
+
+cam = open_source(args.source, loop=False)
+sampler = FrameSampler(target_fps=args.fps)
+gate = None if args.no_gate else SceneChangeGate()
+model = load_variant(runtime.model, device)
+labels = load_labels()
+process = psutil.Process()
+
+latencies = []
+peak_rss = 0
+start = time.time()
+try:
+    while len(latencies) < args.frames:
+        frame = cam.read()
+        if frame is None:
+            break  # end of recording
+        captured = time.perf_counter()
+
+        if not sampler.allow():
+            continue
+
+        if gate is None or gate.should_infer(frame):
+            probs = model.predict(preprocess(frame, runtime.input_size))
+            if gate is not None:
+                gate.store(probs)
+        else:
+            probs = gate.last_result
+        _ = labels[probs.argmax().item()]
+
+        latencies.append((time.perf_counter() - captured) * 1000)
+        peak_rss = max(peak_rss, process.memory_info().rss)
+finally:
+    cam.release()
+elapsed = time.time() - start
+
+lat = np.array(latencies) if latencies else np.zeros(1)
+result = {
+    "pipeline": "edge_mobilenent_pipeline",
+    "frames": len(latencies),
+    "fps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+    "p50_ms": float(np.percentile(lat, 50)),
+    "p95_ms": float(np.percentile(lat, 95)),
+    "p99_ms": float(np.percentile(lat, 99)),
+    "peak_rss_mb": peak_rss / 1024 / 1024,
+    "skipped": gate.skipped if gate is not None else 0,
+}
+
+if args.json:
+    print(json.dumps(result))
+else:
+    print(f"Frames: {result['frames']} | FPS: {result['fps']:.2f} | "
+          f"Latency p50 {result['p50_ms']:.1f} p95 {result['p95_ms']:.1f} "
+          f"p99 {result['p99_ms']:.1f} ms | Peak RSS: {result['peak_rss_mb']:.1f} MB | "
+          f"Gate skipped: {result['skipped']}")
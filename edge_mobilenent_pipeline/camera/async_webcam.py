@@ -0,0 +1,69 @@
+# camera/async_webcam.py
+# Responsibility: Expose a Webcam (or any object with read()/release())
+# as an async iterator of frames, without blocking the event loop.
+
+import asyncio
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+
+_DONE = object()  # End-of-stream marker
+
+
+async def async_frames(cam, queue_size=2, max_failures=30, runtime=None):
+    """
+    Yield frames from cam asynchronously.
+
+    - cam.read() runs on a dedicated single-thread executor, so a slow
+      or blocked camera never stalls other pipelines on the same loop.
+      (cv2.VideoCapture must not be used from two threads at once.)
+    - Frames go through a bounded asyncio.Queue (backpressure).
+    - On exit (end of loop, error or task cancellation) the capture
+      thread is drained and cam.release() is always called.
+
+    max_failures: consecutive failed reads before the stream ends
+                  (camera unplugged / end of file). None = retry forever.
+    runtime:      optional RuntimeConfig; the capture thread pins itself
+                  to the "capture" cores
+    """
+    loop = asyncio.get_running_loop()
+    if runtime is not None:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture",
+                                      initializer=runtime.enter, initargs=("capture",))
+    else:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+    q = asyncio.Queue(maxsize=queue_size)
+
+    async def producer():
+        failures = 0
+        try:
+            while True:
+                frame = await loop.run_in_executor(executor, cam.read)
+                if frame is None:
+                    failures += 1
+                    if max_failures is not None and failures >= max_failures:
+                        break
+                    continue
+                failures = 0
+                await q.put(frame)
+            await q.put(_DONE)
+        except Exception as e:
+            await q.put(e)
+
+    task = asyncio.create_task(producer())
+    try:
+        while True:
+            item = await q.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        # Queued after any in-flight read on the same thread, so release()
+        # never races with cap.read()
+        await asyncio.shield(loop.run_in_executor(executor, cam.release))
+        executor.shutdown(wait=False)
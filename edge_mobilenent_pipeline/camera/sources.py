@@ -0,0 +1,217 @@
+# camera/sources.py
+# Responsibility: Frame sources that behave like Webcam (read() / release())
+# but do not need a physical camera.
+# - VideoFileSource: frames from a video file
+# - SyntheticSource: generated frames (moving gradient + noise)
+# - FrameRecorder / ReplaySource: record any source to a compact file
+#   and play it back deterministically (no camera needed)
+
+import re
+import struct
+import time
+
+import cv2
+import numpy as np
+
+from camera.webcam import Webcam
+
+
+class VideoFileSource:
+    def __init__(self, path, loop=True):
+        """
+        Read frames from a video file.
+
+        loop: restart from the first frame at end of file
+              (otherwise read() returns None, like a disconnected camera)
+        """
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Could not open video file {path}")
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            return None
+        return frame
+
+    def release(self):
+        if self.cap.isOpened():
+            self.cap.release()
+
+
+class SyntheticSource:
+    def __init__(self, width=640, height=480, fps=30, seed=0):
+        """
+        Generate BGR uint8 frames at up to `fps` (0 = as fast as possible).
+
+        The content changes every frame, so downstream stages
+        (resize, colour conversion, model) do real work.
+        """
+        self.width = width
+        self.height = height
+        self.interval = 1.0 / fps if fps > 0 else 0
+        self.rng = np.random.default_rng(seed)
+        self.index = 0
+        self.last = 0
+
+        # Static background, shifted every frame to simulate motion
+        x = np.linspace(0, 255, width, dtype=np.float32)
+        y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+        self.background = np.stack([
+            np.broadcast_to(x, (height, width)),
+            np.broadcast_to(y, (height, width)),
+            (x + y) / 2,
+        ], axis=2).astype(np.uint8)
+
+    def read(self):
+        # Pace like a real camera
+        if self.interval:
+            wait = self.last + self.interval - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            self.last = time.time()
+
+        frame = np.roll(self.background, self.index * 4, axis=1)
+        noise = self.rng.integers(0, 16, size=frame.shape, dtype=np.uint8)
+        frame = cv2.add(frame, noise)
+        self.index += 1
+        return frame
+
+    def release(self):
+        pass
+
+
+# Recording file layout:
+#   b"EDGEREC1"
+#   per frame: float64 timestamp (s, relative to first frame),
+#              uint32 length, `length` bytes of JPEG (or PNG if lossless)
+_MAGIC = b"EDGEREC1"
+_FRAME_HEADER = struct.Struct("<dI")
+
+
+class FrameRecorder:
+    def __init__(self, path, quality=90, lossless=False):
+        """
+        Append frames + capture timestamps to `path`.
+
+        quality:  JPEG quality (90 keeps a 640x480 frame around 50 KB)
+        lossless: store PNG instead (bit-exact, ~10x larger)
+        """
+        self.file = open(path, "wb")
+        self.file.write(_MAGIC)
+        self.ext = ".png" if lossless else ".jpg"
+        self.params = [] if lossless else [cv2.IMWRITE_JPEG_QUALITY, quality]
+        self.first = None
+        self.frames = 0
+
+    def write(self, frame, stamp=None):
+        stamp = time.time() if stamp is None else stamp
+        if self.first is None:
+            self.first = stamp
+        ok, data = cv2.imencode(self.ext, frame, self.params)
+        if not ok:
+            raise RuntimeError("Could not encode frame")
+        self.file.write(_FRAME_HEADER.pack(stamp - self.first, len(data)))
+        self.file.write(data.tobytes())
+        self.frames += 1
+
+    def close(self):
+        self.file.close()
+
+
+class ReplaySource:
+    def __init__(self, path, mode="original", fps=None, loop=False):
+        """
+        Play back a FrameRecorder file.
+
+        mode: "original" - same inter-frame timing as when recorded
+              "fast"     - as fast as frames can be decoded
+              "fixed"    - at `fps` frames per second
+        loop: start over at the end (otherwise read() returns None,
+              like a disconnected camera)
+
+        Frames are decoded lazily, one per read(), so long recordings
+        don't have to fit in RAM.
+        """
+        if mode not in ("original", "fast", "fixed"):
+            raise ValueError(f"Unknown replay mode {mode!r}")
+        if mode == "fixed" and not fps:
+            raise ValueError("mode='fixed' needs fps")
+        self.path = path
+        self.mode = mode
+        self.interval = 1.0 / fps if fps else 0
+        self.loop = loop
+        self.file = open(path, "rb")
+        if self.file.read(len(_MAGIC)) != _MAGIC:
+            raise RuntimeError(f"{path} is not a frame recording")
+        self._restart()
+
+    def _restart(self):
+        self.file.seek(len(_MAGIC))
+        self.start = None   # wall-clock time of the first replayed frame
+        self.index = 0
+
+    def read(self):
+        header = self.file.read(_FRAME_HEADER.size)
+        if len(header) < _FRAME_HEADER.size:
+            if not self.loop or self.index == 0:
+                return None
+            self._restart()
+            header = self.file.read(_FRAME_HEADER.size)
+        stamp, length = _FRAME_HEADER.unpack(header)
+        data = np.frombuffer(self.file.read(length), dtype=np.uint8)
+
+        # Pace relative to the first frame (no drift accumulation)
+        now = time.time()
+        if self.start is None:
+            self.start = now
+        if self.mode == "original":
+            due = self.start + stamp
+        elif self.mode == "fixed":
+            due = self.start + self.index * self.interval
+        else:
+            due = now
+        if due > now:
+            time.sleep(due - now)
+
+        self.index += 1
+        return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+    def release(self):
+        self.file.close()
+
+
+def open_source(spec, loop=True):
+    """
+    Build a frame source from a command-line string:
+    - "0", "1", ...   -> Webcam(cam_id)
+    - "synthetic"     -> SyntheticSource() at 30 FPS
+    - "synthetic:N"   -> SyntheticSource(fps=N), N=0 for unpaced
+    - "clip.rec"      -> ReplaySource, original timing
+    - "clip.rec:fast" -> ReplaySource, as fast as possible
+    - "clip.rec:N"    -> ReplaySource, fixed N FPS
+    - anything else   -> VideoFileSource(path)
+
+    loop: restart recordings / video files at the end (live-like);
+          False makes read() return None once they run out
+    """
+    if spec.isdigit():
+        return Webcam(int(spec))
+    if spec == "synthetic":
+        return SyntheticSource()
+    if spec.startswith("synthetic:"):
+        return SyntheticSource(fps=float(spec.split(":", 1)[1]))
+    match = re.match(r"^(.*\.rec)(?::(.+))?$", spec)
+    if match:
+        path, option = match.groups()
+        if option is None:
+            return ReplaySource(path, loop=loop)
+        if option == "fast":
+            return ReplaySource(path, mode="fast", loop=loop)
+        return ReplaySource(path, mode="fixed", fps=float(option), loop=loop)
+    return VideoFileSource(spec, loop=loop)
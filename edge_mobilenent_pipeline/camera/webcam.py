@@ -1,21 +1,40 @@
 # webcam.py
 # Responsibility:
 # - Initialize a webcam
-# - Set resolution
+# - Set resolution, pixel format and driver buffer size
 # - Capture one frame at a time
 # - Release resources safely
 
+import time
+
 import cv2
+import numpy as np
+
+# Common UVC resolutions, smallest first
+STANDARD_SIZES = [(160, 120), (320, 240), (352, 288), (424, 240), (640, 360), (640, 480),
+                  (800, 600), (960, 540), (1280, 720), (1920, 1080)]
+
+
+def fourcc_to_str(value):
+    value = int(value)
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4))
 
 
 class Webcam:
-    def __init__(self, cam_id=0, width=640, height=480):
+    def __init__(self, cam_id=0, width=640, height=480, fourcc=None, buffer_size=1, center_crop=None):
         """
         Initialize webcam stream.
 
         Parameters:
-        - cam_id: which camera (0 = default)
+        - cam_id: which camera (0 = default); a device path or video
+                  file also works (handy for tests)
         - width/height: capture resolution
+        - fourcc: pixel format, e.g. "MJPG" or "YUYV" (None = driver default)
+        - buffer_size: frames the driver may queue. 1 = always the newest
+                       frame instead of stale ones (None = driver default)
+        - center_crop: (w, h) region cut from the centre of every frame,
+                       or True for the largest centred square. Returned as
+                       a view, no copy.
 
         Think:
         - Why control resolution early?
@@ -24,15 +43,59 @@ class Webcam:
 
         # 1. Create cv2.VideoCapture object
         self.cap = cv2.VideoCapture(cam_id)
-        
-        # 2. Set capture resolution (width + height)
+
+        # 2. Pixel format first: some drivers only offer sizes per format
+        if fourcc is not None:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+
+        # 3. Set capture resolution (width + height)
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
 
-        # 3. Check if camera opened properly
+        # 4. Keep the driver queue short so read() returns a fresh frame
+        if buffer_size is not None:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+        # 5. Check if camera opened properly
         if not self.cap.isOpened():
             raise RuntimeError(f"Could not open camera {cam_id}")
 
+        self.cam_id = cam_id
+        self.requested = {"width": width, "height": height, "fourcc": fourcc, "buffer_size": buffer_size}
+        self.granted = self.query()
+        self.crop = None
+        if center_crop is not None:
+            self.set_center_crop(center_crop)
+
+    def query(self):
+        """
+        What the driver actually granted (it may silently ignore or
+        round any of the requested settings).
+        """
+        return {
+            "width": int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fourcc": fourcc_to_str(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            "fps": self.cap.get(cv2.CAP_PROP_FPS),
+            "buffer_size": int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+        }
+
+    def mismatches(self):
+        """Requested settings the driver did not grant, as {name: (requested, granted)}."""
+        out = {}
+        for key, wanted in self.requested.items():
+            if wanted is not None and self.granted.get(key) != wanted:
+                out[key] = (wanted, self.granted.get(key))
+        return out
+
+    def set_center_crop(self, size):
+        w, h = self.granted["width"], self.granted["height"]
+        if size is True:
+            size = (min(w, h), min(w, h))
+        cw, ch = min(size[0], w), min(size[1], h)
+        x, y = (w - cw) // 2, (h - ch) // 2
+        self.crop = (slice(y, y + ch), slice(x, x + cw))
+
     def read(self):
         """
         Capture and return a single frame.
@@ -44,13 +107,94 @@ class Webcam:
 
         # 1. Read frame using cap.read()
         ret, frame = self.cap.read()
-        
+
         # 2. Return frame if successful, else return None
         if not ret:
             return None
-            
+
+        # 3. Optional centre crop (view into the frame, no copy)
+        if self.crop is not None:
+            return frame[self.crop]
         return frame
 
+    def measure_latency(self, frames=10, warmup=3):
+        """
+        Median time (ms) from read() call to decoded frame, plus the
+        achieved frame rate. Includes any MJPG decode.
+        """
+        for _ in range(warmup):
+            self.cap.read()
+        times = []
+        start = time.perf_counter()
+        for _ in range(frames):
+            t0 = time.perf_counter()
+            ok, _ = self.cap.read()
+            if ok:
+                times.append((time.perf_counter() - t0) * 1000)
+        elapsed = time.perf_counter() - start
+        if not times:
+            return None, 0.0
+        return float(np.median(times)), len(times) / elapsed
+
+    @classmethod
+    def negotiate(cls, cam_id=0, min_size=(224, 224), fourccs=("MJPG", "YUYV"),
+                  min_fps=15, frames=10, report=None, **kwargs):
+        """
+        Open the camera in the cheapest mode that still covers the model
+        input: only modes the driver really grants at >= min_size are
+        considered; among those reaching min_fps, the smallest resolution
+        wins (lower measured capture-to-frame latency breaks ties).
+
+        Slow (reopens the camera per mode): run it once, save mode(),
+        and start from the saved mode with from_mode() afterwards.
+
+        report: optional list; one dict per probed mode is appended
+        kwargs: passed to Webcam (buffer_size, center_crop)
+        """
+        best = None
+        seen = set()
+        for fourcc in fourccs:
+            for w, h in STANDARD_SIZES:
+                if w < min_size[0] or h < min_size[1]:
+                    continue
+                cam = cls(cam_id, w, h, fourcc=fourcc, buffer_size=kwargs.get("buffer_size", 1))
+                try:
+                    g = cam.granted
+                    mode = (g["fourcc"], g["width"], g["height"])
+                    # Driver fell back to a mode we already measured
+                    if mode in seen:
+                        continue
+                    seen.add(mode)
+                    latency, fps = cam.measure_latency(frames)
+                finally:
+                    cam.release()
+
+                entry = {"requested": (fourcc, w, h), "granted": mode, "latency_ms": latency,
+                         "fps": fps, "ok": (latency is not None and g["width"] >= min_size[0]
+                                            and g["height"] >= min_size[1])}
+                if report is not None:
+                    report.append(entry)
+                if not entry["ok"]:
+                    continue
+                key = (fps < min_fps, g["width"] * g["height"], latency)
+                if best is None or key < best[0]:
+                    best = (key, fourcc, w, h)
+
+        if best is None:
+            raise RuntimeError(f"No capture mode of camera {cam_id} covers {min_size}")
+        _, fourcc, w, h = best
+        return cls(cam_id, w, h, fourcc=fourcc, **kwargs)
+
+    def mode(self):
+        """The granted capture mode, e.g. for saving and from_mode() later."""
+        return {"fourcc": self.granted["fourcc"], "width": self.granted["width"],
+                "height": self.granted["height"]}
+
+    @classmethod
+    def from_mode(cls, mode, cam_id=0, **kwargs):
+        """Open in a mode saved from mode() (no probing)."""
+        return cls(cam_id, mode["width"], mode["height"], fourcc=mode["fourcc"], **kwargs)
+
     def release(self):
         """
         Release the webcam safely.
@@ -58,4 +202,4 @@ class Webcam:
         """
         # Call cap.release()
         if hasattr(self, 'cap') and self.cap.isOpened():
-            self.cap.release()
\ No newline at end of file
+            self.cap.release()
@@ -0,0 +1,82 @@
+# compare_transport.py
+# Float32 frames + ToTensor/Normalize  vs  uint8 / float16 frames with the
+# normalization folded into MobileNet's first conv.
+# Reports bytes per queued frame, end-to-end latency (preprocess -> probs)
+# and agreement with the float32 path.
+#
+# Usage: python compare_transport.py [--source synthetic:0] [--frames 100]
+
+import argparse
+import copy
+import time
+
+import numpy as np
+import torch
+
+from camera.sources import open_source
+from pipeline.preprocess import preprocess
+from inference.mobilenet import MobileNetInference, FoldedInputConv
+
+parser = argparse.ArgumentParser(description="Frame transport precision comparison")
+parser.add_argument("--source", default="synthetic:0")
+parser.add_argument("--frames", type=int, default=100)
+args = parser.parse_args()
+
+baseline = MobileNetInference(device="cpu")
+
+# Same weights, first conv folded (no second download / load)
+folded = copy.copy(baseline)
+folded.model = copy.deepcopy(baseline.model)
+folded.model.features[0][0] = FoldedInputConv(baseline.model.features[0][0])
+folded.folded = True
+
+
+def to_float32(img):
+    # What the float32 pipelines queue: normalized [0, 1] float32
+    out = img.astype(np.float32)
+    out *= 1 / 255.0
+    return out
+
+
+modes = [
+    # name, model, frame conversion applied before the "queue"
+    ("float32 + Normalize", baseline, to_float32),
+    ("uint8 folded", folded, lambda img: img),
+    ("float16 folded", folded, lambda img: img.astype(np.float16)),
+]
+
+cam = open_source(args.source, loop=True)
+frames = [preprocess(cam.read()) for _ in range(args.frames)]
+cam.release()
+
+
+def run(model, convert, img):
+    queued = convert(img)
+    if convert is to_float32:
+        # ToTensor would rescale a float array again; feed [0, 1] directly
+        x = torch.from_numpy(queued).permute(2, 0, 1).unsqueeze(0)
+        return queued, model.predict_tensor(x)
+    return queued, model.predict(queued)
+
+
+reference = None
+print(f"{'Mode':<22}{'bytes/frame':>12}{'p50 ms':>9}{'p95 ms':>9}{'top-1 agree':>13}{'max |dp|':>10}")
+for name, model, convert in modes:
+    for img in frames[:5]:  # warm-up
+        run(model, convert, img)
+
+    latencies, tops, probs_all = [], [], []
+    for img in frames:
+        t0 = time.perf_counter()
+        queued, probs = run(model, convert, img)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        tops.append(probs.argmax().item())
+        probs_all.append(probs)
+
+    if reference is None:
+        reference = (tops, probs_all)
+    agree = np.mean([a == b for a, b in zip(tops, reference[0])])
+    max_diff = max((p - r).abs().max().item() for p, r in zip(probs_all, reference[1]))
+    lat = np.array(latencies)
+    print(f"{name:<22}{queued.nbytes:>12}{np.percentile(lat, 50):>9.2f}"
+          f"{np.percentile(lat, 95):>9.2f}{agree:>13.1%}{max_diff:>10.2e}")
@@ -0,0 +1,178 @@
+# compress.py
+# Model compression beyond quantize.py: structured channel pruning of
+# MobileNetV2's inverted-residual blocks (see inference/pruning.py),
+# then knowledge distillation from the fp32 model to win back accuracy.
+# Distillation needs no labels: the student learns to match the
+# teacher's softened outputs on any local image folder.
+#
+# Everything runs on CPU. For each ratio it saves
+# mobilenet_v2_pruned_<percent>.pth and prints latency / size /
+# top-1 agreement with the fp32 model on held-out images.
+# Load a result with MobileNetInference(checkpoint=...), or put its
+# path in runtime.json's "model" field.
+#
+# Usage:
+#   python compress.py --images ../Day2/Data/images --ratios 0.25 0.5 --epochs 5
+
+import argparse
+import copy
+import io
+import os
+import random
+import time
+
+import cv2
+import numpy as np
+import torch
+import torch.nn.functional as F
+import torchvision.transforms as T
+
+from inference.mobilenet import MobileNetInference, IMAGENET_MEAN, IMAGENET_STD
+from inference.pruning import prune_model, save_pruned
+from pipeline.preprocess import preprocess
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+def load_images(folder):
+    """BGR uint8 frames, like the camera's (decoded once; the folder is expected to be small)."""
+    images = []
+    for name in sorted(os.listdir(folder)):
+        if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+            img = cv2.imread(os.path.join(folder, name))
+            if img is not None:
+                images.append(img)
+    return images
+
+
+# Augmentation: a small folder goes a lot further with crops and flips
+train_transform = T.Compose([
+    T.ToPILImage(),
+    T.RandomResizedCrop(224, scale=(0.35, 1.0)),
+    T.RandomHorizontalFlip(),
+    T.ColorJitter(0.2, 0.2, 0.2),
+    T.ToTensor(),
+    T.Normalize(IMAGENET_MEAN, IMAGENET_STD),
+])
+
+
+def distill(student, teacher, images, epochs, batch_size, lr, temperature):
+    """
+    Train student to match teacher's temperature-softened outputs
+    (KL divergence), with BatchNorm statistics kept as pretrained.
+    """
+    batch_size = min(batch_size, len(images))
+    optimizer = torch.optim.Adam(student.parameters(), lr=lr)
+    steps = epochs * max(1, len(images) // batch_size)
+    scheduler = torch.optim.lr_scheduler.CosineAnnealingLR(optimizer, steps)
+    teacher.eval()
+    student.train()
+    # Freeze BatchNorm running stats: a small (often near-identical) folder
+    # would skew them. Only the weights (incl. BN scale/shift) are trained.
+    for module in student.modules():
+        if isinstance(module, torch.nn.BatchNorm2d):
+            module.eval()
+    for epoch in range(epochs):
+        random.shuffle(images)
+        losses = []
+        for i in range(0, len(images) - batch_size + 1, batch_size):
+            batch = torch.stack([train_transform(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+                                 for img in images[i:i + batch_size]])
+            with torch.no_grad():
+                soft_targets = F.softmax(teacher(batch) / temperature, dim=1)
+            log_probs = F.log_softmax(student(batch) / temperature, dim=1)
+            # T^2 keeps gradient size independent of the temperature
+            loss = F.kl_div(log_probs, soft_targets, reduction="batchmean") * temperature ** 2
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            scheduler.step()
+            losses.append(loss.item())
+        print(f"  epoch {epoch + 1}/{epochs}: loss {np.mean(losses):.4f}")
+    student.eval()
+    return student
+
+
+def agreement(wrapper, images, reference):
+    """Top-1 agreement with the reference predictions (same preprocessing as main.py)."""
+    tops = [wrapper.predict(img).argmax().item() for img in images]
+    return float(np.mean([a == b for a, b in zip(tops, reference)]))
+
+
+def latency_ms(wrapper, iterations=50):
+    img = np.zeros((224, 224, 3), dtype=np.uint8)
+    for _ in range(10):  # warm-up
+        wrapper.predict(img)
+    times = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        wrapper.predict(img)
+        times.append((time.perf_counter() - t0) * 1000)
+    return float(np.median(times))
+
+
+def size_mb(model):
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 1e6
+
+
+def run_compression(args):
+    random.seed(0)
+    torch.manual_seed(0)
+
+    teacher_wrapper = MobileNetInference(device="cpu")
+    teacher = teacher_wrapper.model
+
+    images = load_images(args.images)
+    if len(images) < 2:
+        raise SystemExit(f"[ERROR] Need at least 2 images in {args.images}, found {len(images)}")
+    random.shuffle(images)
+    n_val = max(1, int(len(images) * args.val_split))
+    val_images = [preprocess(img) for img in images[:n_val]]
+    train_images = images[n_val:]
+    print(f"[INFO] {len(train_images)} training / {len(val_images)} held-out images")
+
+    reference = [teacher_wrapper.predict(img).argmax().item() for img in val_images]
+    rows = [("fp32", sum(p.numel() for p in teacher.parameters()) / 1e6, size_mb(teacher),
+             latency_ms(teacher_wrapper), None, 1.0)]
+
+    for ratio in args.ratios:
+        print(f"\n[INFO] Pruning {ratio:.0%} of the hidden channels...")
+        student = prune_model(copy.deepcopy(teacher), ratio)
+        wrapper = copy.copy(teacher_wrapper)
+        wrapper.model = student
+        pruned_agree = agreement(wrapper, val_images, reference)
+
+        print(f"[INFO] Distilling ({args.epochs} epochs)...")
+        distill(student, teacher, list(train_images), args.epochs, args.batch_size, args.lr,
+                args.temperature)
+
+        path = os.path.join(args.output_dir, f"mobilenet_v2_pruned_{round(ratio * 100)}.pth")
+        save_pruned(student, path, ratio=ratio)
+
+        # Reload through the inference wrapper: what the pipelines will run
+        loaded = MobileNetInference(device="cpu", checkpoint=path)
+        rows.append((f"pruned {ratio:.0%}", sum(p.numel() for p in student.parameters()) / 1e6,
+                     size_mb(student), latency_ms(loaded), pruned_agree,
+                     agreement(loaded, val_images, reference)))
+        print(f"[INFO] Saved {path}")
+
+    print(f"\n{'Model':<14}{'Params M':>10}{'Size MB':>9}{'Latency ms':>12}{'Agree (pruned)':>16}{'Agree (distilled)':>19}")
+    for name, params, size, latency, pruned_agree, agree in rows:
+        pruned_text = "-" if pruned_agree is None else f"{pruned_agree:.1%}"
+        print(f"{name:<14}{params:>10.2f}{size:>9.2f}{latency:>12.2f}{pruned_text:>16}{agree:>19.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prune + distill MobileNetV2 (CPU)")
+    parser.add_argument("--images", required=True, help="folder of unlabeled images")
+    parser.add_argument("--ratios", nargs="+", type=float, default=[0.25, 0.5],
+                        help="fraction of hidden channels to remove per block")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--lr", type=float, default=1e-4)
+    parser.add_argument("--temperature", type=float, default=4.0)
+    parser.add_argument("--val-split", type=float, default=0.2, help="held-out fraction for agreement")
+    parser.add_argument("--output-dir", default=".")
+    run_compression(parser.parse_args())
@@ -0,0 +1,66 @@
+# inference/client.py
+# Thin client for the local inference server (serve.py).
+# Drop-in replacement for MobileNetInference.predict:
+#
+#     model = MobileNetInference(device=device)
+# becomes
+#     model = InferenceClient("/tmp/mobilenet.sock")
+
+import itertools
+import socket
+
+import numpy as np
+import torch
+
+from inference import protocol
+from pipeline.shm_ring import SharedFrameRing
+
+
+class InferenceClient:
+    def __init__(self, socket_path="/tmp/mobilenet.sock", shape=(224, 224, 3)):
+        """
+        Connects to the server and shares a one-slot frame buffer with it.
+        One request in flight at a time: use one client per thread.
+        """
+        self.ring = SharedFrameRing(1, shape)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.sock.connect(socket_path)
+            protocol.send_json(self.sock, {"shm": self.ring.name, "slots": 1, "shape": list(shape)})
+            reply = protocol.recv_json(self.sock)
+            if reply is None:
+                raise ConnectionError("Inference server closed the connection")
+        except Exception:
+            self.sock.close()
+            self.ring.close()
+            raise
+        self.classes = reply["classes"]
+        self.ids = itertools.count()
+
+    def predict(self, image):
+        """
+        image: RGB image, numpy array (HWC, uint8) of the shape given at init
+        returns: softmax probabilities as torch.Tensor, shape (1, classes)
+        """
+        slot = self.ring.slot(0)
+        if image.shape != slot.shape:
+            raise ValueError(f"Expected image of shape {slot.shape}, got {image.shape}")
+        slot[...] = image
+
+        request_id = next(self.ids) & 0xFFFFFFFF
+        self.sock.sendall(protocol.REQUEST.pack(request_id, 0))
+
+        size = protocol.RESPONSE_HEADER.size + 4 * self.classes
+        data = protocol.recv_exact(self.sock, size)
+        if data is None:
+            raise ConnectionError("Inference server closed the connection")
+        (reply_id,) = protocol.RESPONSE_HEADER.unpack_from(data)
+        if reply_id != request_id:
+            raise RuntimeError(f"Out-of-order response {reply_id} (expected {request_id})")
+
+        probs = np.frombuffer(data, dtype=np.float32, offset=protocol.RESPONSE_HEADER.size)
+        return torch.from_numpy(probs.copy()).unsqueeze(0)
+
+    def close(self):
+        self.sock.close()
+        self.ring.close()
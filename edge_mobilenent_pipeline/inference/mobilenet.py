@@ -1,35 +1,131 @@
 # inference/mobilenet.py
 
+import os
+
+import numpy as np
 import torch
+import torch.nn.functional as F
 import torchvision.transforms as T
 from torchvision import models
 
+from inference.pruning import load_pruned
+
+IMAGENET_MEAN = [0.485, 0.456, 0.406]  # ImageNet RGB mean
+IMAGENET_STD = [0.229, 0.224, 0.225]   # ImageNet RGB std
+MODEL_VARIANTS = ("fp32", "folded", "int8")
+
+
+class FoldedInputConv(torch.nn.Module):
+    def __init__(self, conv, mean=IMAGENET_MEAN, std=IMAGENET_STD, scale=255.0):
+        """
+        Replacement for the model's first Conv2d that takes RAW pixels
+        (0-255) and gives the same output as conv(normalize(x / 255)).
+
+        (x / scale - mean) / std  is linear per channel, so it folds into
+        the conv: weights are divided by scale * std, and the mean shows
+        up as a bias. The original conv zero-pads the NORMALIZED image,
+        i.e. pads with raw value mean * scale; a per-input-size border
+        correction map makes the borders exact too.
+        """
+        super().__init__()
+        mean = torch.tensor(mean, dtype=torch.float32).view(1, -1, 1, 1)
+        std = torch.tensor(std, dtype=torch.float32).view(1, -1, 1, 1)
+        weight = conv.weight.detach().float()
+
+        self.stride = conv.stride
+        self.padding = conv.padding
+        self.dilation = conv.dilation
+        self.groups = conv.groups
+
+        bias = -(weight * (mean / std)).sum(dim=(1, 2, 3))
+        if conv.bias is not None:
+            bias = bias + conv.bias.detach()
+        self.weight = torch.nn.Parameter(weight / (std * scale), requires_grad=False)
+        self.bias = torch.nn.Parameter(bias, requires_grad=False)
+        self.register_buffer("pad_value", mean * scale)
+        self.corrections = {}   # (H, W, device) -> border correction map
+
+    def _correction(self, x):
+        key = (x.shape[-2], x.shape[-1], x.device)
+        corr = self.corrections.get(key)
+        if corr is None:
+            ph, pw = self.padding
+            h, w = x.shape[-2], x.shape[-1]
+            # Padding ring filled with the raw "normalized zero", image area zero
+            ring = self.pad_value.expand(1, -1, h + 2 * ph, w + 2 * pw).clone()
+            ring[..., ph:ph + h, pw:pw + w] = 0
+            with torch.no_grad():
+                corr = F.conv2d(ring, self.weight, None, self.stride, 0, self.dilation, self.groups)
+            self.corrections[key] = corr
+        return corr
+
+    def forward(self, x):
+        out = F.conv2d(x, self.weight, self.bias, self.stride, self.padding, self.dilation, self.groups)
+        if any(self.padding):
+            out = out + self._correction(x)
+        return out
+
 
 class MobileNetInference:
-    def __init__(self, device="cpu"):
-        # Store the device (CPU or CUDA)
-        self.device = device
+    def __init__(self, device="cpu", fold_normalization=False, quantized=False, checkpoint=None):
+        """
+        fold_normalization: fold /255 + ImageNet mean/std into the first
+            conv. predict() then takes uint8 (or float16 0-255) frames as-is,
+            so frames stay 1-2 bytes/pixel right up to the model.
+        quantized: torchvision's pre-quantized int8 MobileNetV2 (about a
+            quarter of the weight memory). CPU only.
+        checkpoint: pruned + distilled model saved by compress.py
+            (instead of the stock pretrained weights)
+        """
+        if quantized and fold_normalization:
+            raise ValueError("fold_normalization is not supported for the int8 model")
+        if quantized and checkpoint:
+            raise ValueError("checkpoint is not supported for the int8 model")
+
+        # Store the device (CPU or CUDA); quantized kernels only run on CPU
+        self.device = "cpu" if quantized else device
+        self.folded = fold_normalization
+        self.quantized = quantized
 
         # Load pretrained MobileNetV2 model from torchvision
-        self.model = models.mobilenet_v2(pretrained=True)
+        if quantized:
+            self.model = models.quantization.mobilenet_v2(pretrained=True, quantize=True)
+        elif checkpoint:
+            self.model = load_pruned(checkpoint)
+        else:
+            self.model = models.mobilenet_v2(pretrained=True)
+        if fold_normalization:
+            # features[0] = Conv2dNormActivation(conv, bn, relu6)
+            self.model.features[0][0] = FoldedInputConv(self.model.features[0][0])
         self.model.eval().to(self.device)
 
         # Define image transform: tensor + normalize (ImageNet standard)
+        self.normalize = T.Normalize(
+            mean=IMAGENET_MEAN,
+            std=IMAGENET_STD
+        )
         self.transform = T.Compose([
             T.ToTensor(),  # Converts HWC uint8 image → CHW float32 tensor
-            T.Normalize(
-                mean=[0.485, 0.456, 0.406],  # ImageNet RGB mean
-                std=[0.229, 0.224, 0.225]    # ImageNet RGB std
-            )
+            self.normalize
         ])
 
+    def _to_tensor(self, images):
+        if self.folded:
+            # Raw pixels go straight in: one upcast, no scaling pass
+            batch = np.stack(images) if isinstance(images, list) else images[None]
+            return torch.from_numpy(batch).to(self.device).permute(0, 3, 1, 2).float()
+        if isinstance(images, list):
+            return torch.stack([self.transform(img) for img in images]).to(self.device)
+        return self.transform(images).unsqueeze(0).to(self.device)
+
     def predict(self, image):
         """
         image: RGB image, numpy array (HWC, uint8)
+               (float16 with values 0-255 also works when folded)
         returns: softmax probabilities as torch.Tensor
         """
         # Apply transforms and add batch dimension
-        tensor = self.transform(image).unsqueeze(0).to(self.device)
+        tensor = self._to_tensor(image)
 
         # Run model inference
         with torch.no_grad():
@@ -38,3 +134,65 @@ class MobileNetInference:
 
         return prob
 
+    def predict_batch(self, images):
+        """
+        images: list of RGB images, numpy arrays (HWC, uint8), same size
+        returns: softmax probabilities as torch.Tensor, shape (N, 1000)
+                 (row i belongs to images[i])
+        """
+        # One forward pass for the whole batch
+        tensor = self._to_tensor(list(images))
+
+        with torch.no_grad():
+            output = self.model(tensor)
+            prob = torch.nn.functional.softmax(output, dim=1)
+
+        return prob
+
+    def predict_tensor(self, tensor):
+        """
+        tensor: float tensor (N, 3, H, W) scaled to [0, 1], not yet normalized
+                (e.g. built zero-copy with torch.from_numpy)
+        returns: softmax probabilities as torch.Tensor, shape (N, 1000)
+        """
+        tensor = tensor.to(self.device)
+        tensor = tensor * 255 if self.folded else self.normalize(tensor)
+
+        with torch.no_grad():
+            output = self.model(tensor)
+            prob = torch.nn.functional.softmax(output, dim=1)
+
+        return prob
+
+
+def prefetch_weights(variant="fp32"):
+    """
+    Download a variant's pretrained weights into torch's hub cache
+    without building the model, so a later load_variant() works
+    offline (e.g. the memory governor switching to int8 mid-run).
+    Returns the cached file path.
+    """
+    if variant == "int8":
+        url = models.quantization.MobileNet_V2_QuantizedWeights.DEFAULT.url
+    else:
+        url = models.MobileNet_V2_Weights.IMAGENET1K_V1.url  # what pretrained=True loads
+    path = os.path.join(torch.hub.get_dir(), "checkpoints", os.path.basename(url))
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        torch.hub.download_url_to_file(url, path, progress=False)
+    return path
+
+
+def load_variant(variant="fp32", device="cpu"):
+    """
+    MobileNetInference by name (e.g. RuntimeConfig.model):
+    fp32 = stock model, folded = normalization folded into the first
+    conv (takes raw uint8), int8 = pre-quantized (CPU only).
+    A path to a compress.py checkpoint (.pth) loads that pruned model.
+    """
+    if variant.endswith(".pth"):
+        return MobileNetInference(device=device, checkpoint=variant)
+    if variant not in MODEL_VARIANTS:
+        raise ValueError(f"Unknown model variant {variant!r}, expected one of {MODEL_VARIANTS}")
+    return MobileNetInference(device=device, fold_normalization=variant == "folded",
+                              quantized=variant == "int8")
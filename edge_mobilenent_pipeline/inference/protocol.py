@@ -0,0 +1,42 @@
+# inference/protocol.py
+# Wire format between InferenceClient and InferenceServer (Unix socket).
+# Pixels never go through the socket: they sit in a shared-memory ring
+# owned by the client, and requests only carry a slot index.
+#
+#   hello    client -> server : u32 length + JSON {"shm", "slots", "shape"}
+#   hello    server -> client : u32 length + JSON {"classes"}
+#   request  client -> server : u32 request_id, u32 slot
+#   response server -> client : u32 request_id + float32[classes] probabilities
+
+import json
+import struct
+
+REQUEST = struct.Struct("!II")
+RESPONSE_HEADER = struct.Struct("!I")
+LENGTH = struct.Struct("!I")
+
+
+def recv_exact(sock, n):
+    """Read exactly n bytes; returns None if the peer closed the socket."""
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:], n - got)
+        if k == 0:
+            return None
+        got += k
+    return bytes(buf)
+
+
+def send_json(sock, obj):
+    data = json.dumps(obj).encode()
+    sock.sendall(LENGTH.pack(len(data)) + data)
+
+
+def recv_json(sock):
+    header = recv_exact(sock, LENGTH.size)
+    if header is None:
+        return None
+    data = recv_exact(sock, LENGTH.unpack(header)[0])
+    return None if data is None else json.loads(data)
@@ -0,0 +1,99 @@
+# inference/pruning.py
+# Responsibility: Structured channel pruning of MobileNetV2.
+#
+# Only the EXPANDED (hidden) channels inside each inverted-residual block
+# are removed: expand 1x1 -> depthwise 3x3 -> project 1x1. Block inputs
+# and outputs keep their width, so residual connections stay valid and
+# the rest of the network is untouched. The result is a plain, smaller
+# dense model (no sparse kernels needed).
+#
+# Checkpoints store the kept width per block next to the weights, so
+# build_pruned() can recreate the architecture before loading them.
+
+import torch
+from torch import nn
+from torchvision import models
+
+
+def prunable_blocks(model):
+    """(index, block) of every inverted-residual block with an expand conv."""
+    # features[1] has expand_ratio 1: its hidden width IS its input width
+    return [(i, block) for i, block in enumerate(model.features)
+            if hasattr(block, "conv") and len(block.conv) == 4]
+
+
+def hidden_widths(model):
+    """Hidden (expanded) channels per prunable block, {features index: width}."""
+    return {i: block.conv[1][0].out_channels for i, block in prunable_blocks(model)}
+
+
+def _conv_subset(conv, out_idx=None, in_idx=None):
+    weight = conv.weight.detach()
+    if out_idx is not None:
+        weight = weight[out_idx]
+    if in_idx is not None and conv.groups == 1:
+        weight = weight[:, in_idx]
+    groups = weight.shape[0] if conv.groups > 1 else 1  # depthwise stays depthwise
+    new = nn.Conv2d(weight.shape[1] * groups, weight.shape[0], conv.kernel_size, conv.stride,
+                    conv.padding, conv.dilation, groups, bias=conv.bias is not None)
+    new.weight.data.copy_(weight)
+    if conv.bias is not None:
+        new.bias.data.copy_(conv.bias.detach()[out_idx] if out_idx is not None else conv.bias.detach())
+    return new
+
+
+def _bn_subset(bn, idx):
+    new = nn.BatchNorm2d(len(idx), bn.eps, bn.momentum)
+    new.weight.data.copy_(bn.weight.detach()[idx])
+    new.bias.data.copy_(bn.bias.detach()[idx])
+    new.running_mean.copy_(bn.running_mean[idx])
+    new.running_var.copy_(bn.running_var[idx])
+    return new
+
+
+def prune_block(block, keep):
+    """Keep only hidden channels `keep` (1-D index tensor) of one block, in place."""
+    expand, depthwise, project = block.conv[0], block.conv[1], block.conv[2]
+    expand[0] = _conv_subset(expand[0], out_idx=keep)
+    expand[1] = _bn_subset(expand[1], keep)
+    depthwise[0] = _conv_subset(depthwise[0], out_idx=keep)
+    depthwise[1] = _bn_subset(depthwise[1], keep)
+    block.conv[2] = _conv_subset(project, in_idx=keep)
+
+
+def prune_model(model, ratio):
+    """
+    Remove `ratio` (0-1) of the hidden channels of every prunable block,
+    in place. Channels are ranked by the |gamma| of the depthwise BN
+    (a channel the BN scales towards zero contributes little), and the
+    kept count is rounded to a multiple of 8 for the SIMD kernels.
+    """
+    for _, block in prunable_blocks(model):
+        gamma = block.conv[1][1].weight.detach().abs()
+        hidden = gamma.numel()
+        keep_n = max(8, int(round(hidden * (1 - ratio) / 8)) * 8)
+        keep = torch.argsort(gamma, descending=True)[:keep_n].sort().values
+        prune_block(block, keep)
+    return model
+
+
+def build_pruned(widths):
+    """Untrained MobileNetV2 with the given hidden widths ({features index: width})."""
+    model = models.mobilenet_v2(pretrained=False)
+    for i, block in prunable_blocks(model):
+        width = widths.get(i)
+        if width is not None:
+            prune_block(block, torch.arange(width))
+    return model
+
+
+def save_pruned(model, path, **info):
+    """Weights + per-block widths (+ any extra info, e.g. the ratio)."""
+    torch.save({"widths": hidden_widths(model), "state_dict": model.state_dict(), **info}, path)
+
+
+def load_pruned(path):
+    checkpoint = torch.load(path, map_location="cpu")
+    model = build_pruned({int(k): v for k, v in checkpoint["widths"].items()})
+    model.load_state_dict(checkpoint["state_dict"])
+    return model
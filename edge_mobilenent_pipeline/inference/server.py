@@ -0,0 +1,228 @@
+# inference/server.py
+# Responsibility: Serve ONE model to many local pipelines.
+# - One reader thread per client connection (Unix domain socket)
+# - One batching thread: collects requests from all clients into a batch
+#   (up to max_batch, waiting at most max_delay for more) and runs a
+#   single forward pass
+# - Frames are read from each client's shared-memory ring (no pickling)
+
+import collections
+import os
+import queue
+import socket
+import threading
+import time
+
+import numpy as np
+import torch
+
+from inference import protocol
+from pipeline.shm_ring import SharedFrameRing
+
+
+class _Client:
+    def __init__(self, conn, ring):
+        self.conn = conn
+        self.ring = ring
+        self.send_lock = threading.Lock()
+
+
+class ServerStats:
+    def __init__(self, window=1000):
+        """Queue depth, batch-size histogram and request latency (last `window` requests)."""
+        self.lock = threading.Lock()
+        self.batch_sizes = collections.Counter()
+        self.latencies = collections.deque(maxlen=window)   # seconds
+        self.queue_depths = collections.deque(maxlen=window)
+        self.requests = 0
+
+    def record_batch(self, size, depth, latencies):
+        with self.lock:
+            self.batch_sizes[size] += 1
+            self.queue_depths.append(depth)
+            self.latencies.extend(latencies)
+            self.requests += size
+
+    def report(self):
+        with self.lock:
+            lat = np.array(self.latencies) * 1000
+            depths = np.array(self.queue_depths)
+            hist = dict(sorted(self.batch_sizes.items()))
+            requests = self.requests
+        if not len(lat):
+            return "no requests yet"
+        return (f"requests {requests} | queue depth avg {depths.mean():.1f} max {depths.max()} | "
+                f"latency p50 {np.percentile(lat, 50):.1f} p95 {np.percentile(lat, 95):.1f} "
+                f"p99 {np.percentile(lat, 99):.1f} ms | batch sizes {hist}")
+
+
+class InferenceServer:
+    def __init__(self, model, socket_path="/tmp/mobilenet.sock", max_batch=8, max_delay_ms=5.0):
+        """
+        model:        MobileNetInference (needs predict_tensor)
+        socket_path:  Unix domain socket to listen on
+        max_batch:    max requests per forward pass
+        max_delay_ms: how long the first request of a batch may wait for more
+        """
+        self.model = model
+        self.socket_path = socket_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.requests = queue.Queue()   # (client, request_id, slot, arrival) or (client, None, ...) = close
+        self.stats = ServerStats()
+        self.running = True
+        self.classes = None
+
+    # -------------------------------------------------------------
+    # Connections
+    # -------------------------------------------------------------
+    def _handle(self, conn):
+        try:
+            hello = protocol.recv_json(conn)
+            if hello is None:
+                conn.close()
+                return
+            ring = SharedFrameRing(hello["slots"], hello["shape"], name=hello["shm"])
+        except Exception as e:
+            # Bad hello or a ring we can't attach to: drop this client only
+            print(f"[WARN] Client handshake failed ({e!r}); closing it")
+            conn.close()
+            return
+        client = _Client(conn, ring)
+        try:
+            protocol.send_json(conn, {"classes": self.classes})
+        except OSError:
+            conn.close()
+            ring.close()
+            return
+
+        try:
+            while self.running:
+                data = protocol.recv_exact(conn, protocol.REQUEST.size)
+                if data is None:
+                    break
+                request_id, slot = protocol.REQUEST.unpack(data)
+                if slot >= ring.slots:
+                    # Protocol violation: drop this client, nobody else
+                    print(f"[WARN] Client sent slot {slot} for a {ring.slots}-slot ring; closing it")
+                    break
+                self.requests.put((client, request_id, slot, time.time()))
+        except OSError:
+            pass
+        finally:
+            # Let the batcher close the ring once this client's
+            # pending requests have gone through (queue is FIFO)
+            self.requests.put((client, None, None, None))
+
+    # -------------------------------------------------------------
+    # Dynamic batching
+    # -------------------------------------------------------------
+    def _collect(self):
+        """Block for the first request, then gather more until full or max_delay expires."""
+        batch = [self.requests.get()]
+        deadline = time.time() + self.max_delay
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.requests.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _infer(self, work):
+        frames = np.stack([c.ring.slot(s) for c, _, s, _ in work])
+        x = torch.from_numpy(frames).permute(0, 3, 1, 2).float().div_(255)
+        return self.model.predict_tensor(x).cpu().numpy().astype(np.float32)
+
+    def _infer_safe(self, work):
+        """
+        Run the batch; if it fails, retry request by request so only the
+        bad ones are dropped (their connection is shut down, the client
+        gets a ConnectionError). Returns (work, probs) that succeeded.
+        """
+        try:
+            return work, self._infer(work)
+        except Exception as e:
+            if len(work) == 1:
+                print(f"[WARN] Dropping request: {e!r}")
+                self._drop(work[0][0])
+                return [], []
+        done, probs = [], []
+        for item in work:
+            ok, p = self._infer_safe([item])
+            done += ok
+            probs += list(p)
+        return done, probs
+
+    def _drop(self, client):
+        # Ends the client's reader thread, which then queues the close marker
+        try:
+            client.conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _batch_loop(self):
+        while self.running:
+            batch = self._collect()
+            depth = self.requests.qsize()
+
+            work, closing = [], []
+            for client, request_id, slot, arrival in batch:
+                if request_id is None:
+                    closing.append(client)
+                else:
+                    work.append((client, request_id, slot, arrival))
+
+            if work:
+                # Never let one bad request kill the batching thread
+                work, probs = self._infer_safe(work)
+            if work:
+                now = time.time()
+                for (client, request_id, _, _), p in zip(work, probs):
+                    try:
+                        with client.send_lock:
+                            client.conn.sendall(protocol.RESPONSE_HEADER.pack(request_id) + p.tobytes())
+                    except OSError:
+                        pass  # client went away; its reader thread cleans up
+                self.stats.record_batch(len(work), depth, [now - a for _, _, _, a in work])
+
+            # Only now: this batch may still have read from a closing client's ring
+            for client in closing:
+                client.conn.close()
+                client.ring.close()
+
+    # -------------------------------------------------------------
+    # Main entry
+    # -------------------------------------------------------------
+    def serve_forever(self, report_every=10.0):
+        # Number of output classes, from one dummy pass
+        self.classes = self.model.predict_tensor(torch.zeros(1, 3, 224, 224)).shape[1]
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen()
+        server.settimeout(1.0)
+
+        threading.Thread(target=self._batch_loop, daemon=True).start()
+        print(f"[INFO] Serving on {self.socket_path} "
+              f"(max batch {self.max_batch}, max delay {self.max_delay * 1000:.1f} ms)")
+
+        last_report = time.time()
+        try:
+            while self.running:
+                try:
+                    conn, _ = server.accept()
+                    threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+                except socket.timeout:
+                    pass
+                if report_every and time.time() - last_report >= report_every:
+                    print(f"[STATS] {self.stats.report()}")
+                    last_report = time.time()
+        finally:
+            self.running = False
+            server.close()
+            os.remove(self.socket_path)
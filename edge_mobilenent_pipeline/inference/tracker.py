@@ -0,0 +1,206 @@
+# inference/tracker.py
+# Responsibility: Detect-then-track.
+# Run the (expensive) detector every K frames, and in between move the
+# boxes with sparse optical flow (Lucas-Kanade) on the raw frames.
+# Detections are matched to existing tracks by IoU so track IDs stay stable.
+
+import cv2
+import numpy as np
+
+
+def iou(a, b):
+    """IoU of two boxes [x1, y1, x2, y2]."""
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def match_boxes(boxes_a, boxes_b, min_iou=0.3):
+    """
+    Greedy IoU matching (highest IoU first).
+    Returns a list of (index_a, index_b, iou).
+    """
+    pairs = []
+    for i, a in enumerate(boxes_a):
+        for j, b in enumerate(boxes_b):
+            v = iou(a, b)
+            if v >= min_iou:
+                pairs.append((v, i, j))
+    pairs.sort(reverse=True)
+
+    used_a, used_b, matches = set(), set(), []
+    for v, i, j in pairs:
+        if i in used_a or j in used_b:
+            continue
+        used_a.add(i)
+        used_b.add(j)
+        matches.append((i, j, v))
+    return matches
+
+
+class Track:
+    def __init__(self, track_id, box, conf, cls):
+        self.id = track_id
+        self.box = np.asarray(box, dtype=np.float32)  # x1, y1, x2, y2 (raw frame pixels)
+        self.conf = float(conf)   # detector confidence at last detection
+        self.cls = int(cls)
+        self.quality = 1.0        # fraction of flow points tracked last step
+
+
+class BoxTracker:
+    def __init__(self, min_iou=0.3, max_points=30):
+        """
+        min_iou:    minimum IoU to keep a track ID across detections
+        max_points: feature points tracked per box
+        """
+        self.min_iou = min_iou
+        self.max_points = max_points
+        self.tracks = []
+        self.next_id = 1
+        self.prev_gray = None
+
+    def _gray(self, frame):
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+
+    def update(self, frame, detections):
+        """
+        Replace boxes with fresh detections, keeping IDs of matched tracks.
+
+        detections: array (N, 6) of [x1, y1, x2, y2, conf, cls] in frame pixels
+        """
+        dets = [d for d in detections]
+        matches = match_boxes([t.box for t in self.tracks], [d[:4] for d in dets], self.min_iou)
+
+        new_tracks = []
+        matched = set()
+        for ti, di, _ in matches:
+            # Same object only if the class agrees
+            if self.tracks[ti].cls != int(dets[di][5]):
+                continue
+            t = self.tracks[ti]
+            t.box = np.asarray(dets[di][:4], dtype=np.float32)
+            t.conf = float(dets[di][4])
+            t.quality = 1.0
+            new_tracks.append(t)
+            matched.add(di)
+
+        for di, d in enumerate(dets):
+            if di not in matched:
+                new_tracks.append(Track(self.next_id, d[:4], d[4], d[5]))
+                self.next_id += 1
+
+        self.tracks = new_tracks
+        self.prev_gray = self._gray(frame)
+        return self.tracks
+
+    def propagate(self, frame):
+        """
+        Move every track from the previous frame to `frame` with LK flow.
+
+        Returns the tracking confidence: the lowest fraction of points
+        that survived (forward-backward check) over all tracks.
+        1.0 if there is nothing to track.
+        """
+        gray = self._gray(frame)
+        if self.prev_gray is None or not self.tracks:
+            self.prev_gray = gray
+            return 1.0
+
+        h, w = gray.shape
+        confidence = 1.0
+        for t in self.tracks:
+            x1, y1, x2, y2 = np.clip(t.box, 0, [w - 1, h - 1, w - 1, h - 1]).astype(int)
+            if x2 - x1 < 4 or y2 - y1 < 4:
+                t.quality = 0.0
+                confidence = 0.0
+                continue
+
+            mask = np.zeros_like(gray)
+            mask[y1:y2, x1:x2] = 255
+            p0 = cv2.goodFeaturesToTrack(self.prev_gray, self.max_points, 0.01, 3, mask=mask)
+            if p0 is None:
+                t.quality = 0.0
+                confidence = 0.0
+                continue
+
+            p1, st, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, p0, None)
+            # Forward-backward check: points must come back where they started
+            p0r, st_back, _ = cv2.calcOpticalFlowPyrLK(gray, self.prev_gray, p1, None)
+            fb_err = np.linalg.norm((p0 - p0r).reshape(-1, 2), axis=1)
+            good = (st.ravel() == 1) & (st_back.ravel() == 1) & (fb_err < 1.0)
+
+            t.quality = good.sum() / len(p0)
+            confidence = min(confidence, t.quality)
+            if good.sum() < 2:
+                continue
+
+            a = p0.reshape(-1, 2)[good]
+            b = p1.reshape(-1, 2)[good]
+            # Median shift is robust to a few bad points
+            dx, dy = np.median(b - a, axis=0)
+
+            # Scale from the spread of the points around their centre
+            spread_a = np.median(np.linalg.norm(a - a.mean(axis=0), axis=1))
+            spread_b = np.median(np.linalg.norm(b - b.mean(axis=0), axis=1))
+            scale = spread_b / spread_a if spread_a > 1e-3 else 1.0
+
+            cx = (t.box[0] + t.box[2]) / 2 + dx
+            cy = (t.box[1] + t.box[3]) / 2 + dy
+            bw = (t.box[2] - t.box[0]) * scale
+            bh = (t.box[3] - t.box[1]) * scale
+            t.box = np.array([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], dtype=np.float32)
+
+        self.prev_gray = gray
+        return confidence
+
+
+class TrackingDetector:
+    def __init__(self, detector, preprocess, detect_every=5, min_confidence=0.5):
+        """
+        detector:       YoloInference (anything with detect(image) -> (N, 6))
+        preprocess:     frame -> detector input (e.g. pipeline.preprocess)
+        detect_every:   run the detector at least every K frames
+        min_confidence: also re-detect when tracking confidence drops below this
+        """
+        self.detector = detector
+        self.preprocess = preprocess
+        self.detect_every = detect_every
+        self.min_confidence = min_confidence
+        self.tracker = BoxTracker()
+        self.since_detect = None   # frames since last detection (None = never)
+
+        # Counters
+        self.frames = 0
+        self.detector_calls = 0
+
+    def step(self, frame):
+        """
+        Process one raw BGR frame.
+        Returns a list of Track (id, box in frame pixels, conf, cls).
+        """
+        self.frames += 1
+
+        if self.since_detect is not None and self.detect_every > 1:
+            # Move boxes to this frame first: keeps IoU matching (and IDs)
+            # reliable even when we re-detect below
+            confidence = self.tracker.propagate(frame)
+            self.since_detect += 1
+            if self.since_detect < self.detect_every and confidence >= self.min_confidence:
+                return self.tracker.tracks
+
+        img = self.preprocess(frame)
+        dets = self.detector.detect(img)
+
+        # Boxes come back in detector-input pixels; map to the raw frame
+        if len(dets):
+            sx = frame.shape[1] / img.shape[1]
+            sy = frame.shape[0] / img.shape[0]
+            dets = dets.copy()
+            dets[:, [0, 2]] *= sx
+            dets[:, [1, 3]] *= sy
+
+        self.detector_calls += 1
+        self.since_detect = 0
+        return self.tracker.update(frame, dets)
@@ -49,3 +49,14 @@ class YoloInference:
         
         results = self.model(image)
         return results
+
+    def detect(self, image):
+        """
+        Same as predict(), but returns plain detections.
+
+        Returns:
+            numpy array (N, 6): [x1, y1, x2, y2, confidence, class]
+            in pixels of `image`
+        """
+        results = self.predict(image)
+        return results.xyxy[0].cpu().numpy()
@@ -1,49 +1,168 @@
 # main.py
 # Orchestrates full live MobileNet pipeline on Jetson Nano
+#
+# Usage: python main.py [source]
+#   source: camera id (default 0), recording (clip.rec[:fast|:N]),
+#           video file or 'synthetic' - see camera/sources.py
 
 from camera.webcam import Webcam
+from camera.sources import open_source
 from pipeline.sampler import FrameSampler
 from pipeline.preprocess import preprocess
-from inference.mobilenet import MobileNetInference
+from pipeline.scene_gate import SceneChangeGate
+from inference.mobilenet import load_variant, prefetch_weights
 from app_utils.metrics import Monitor
 from app_utils.labels import load_labels
+from app_utils.runtime import RuntimeConfig
+from app_utils.tracing import tracer
+from app_utils.governor import MemoryGovernor, release_memory
 import torch
+import sys
+
+# Process RSS budget (the board has ~4 GB shared with the GPU)
+MEMORY_BUDGET_MB = 1500
+LOW_INPUT_SIZE = (160, 160)
 
 # 🧠 Detect Jetson GPU
 device = "cuda" if torch.cuda.is_available() else "cpu"
 print(f"[INFO] Using device: {device}")
 
+# ⚙️ Thread pools + core affinity + pipeline settings
+# (runtime.json from autotune_threads.py / autotune.py, or defaults)
+runtime = RuntimeConfig.load()
+runtime.apply_libraries()
+runtime.enter("capture", "preprocess", "inference")  # single loop does all stages
+print(f"[INFO] Runtime: {runtime}")
+
+# 🔍 Opt-in timeline: EDGE_TRACE=trace.json python main.py
+if tracer.enable_from_env():
+    print(f"[INFO] Tracing to {tracer.path}")
+
+
+def open_camera():
+    """
+    Camera in the mode saved in runtime.json. Negotiating (probing every
+    mode) is slow, so it only happens when no usable mode is saved yet;
+    re-run it on request with: python probe_camera.py --save
+    """
+    mode = runtime.camera
+    if mode and mode["width"] >= runtime.input_size[0] and mode["height"] >= runtime.input_size[1]:
+        return Webcam.from_mode(mode)
+    print("[INFO] No saved camera mode: negotiating (first start only)...")
+    cam = Webcam.negotiate(min_size=runtime.input_size)
+    runtime.camera = cam.mode()
+    runtime.save()
+    print(f"[INFO] Saved camera mode {runtime.camera}")
+    return cam
+
+
 #  Initialize all modules
-cam = Webcam()                                # Live video source
-sampler = FrameSampler(target_fps=5)          # FPS controller
-monitor = Monitor()                           # Performance monitor
-model = MobileNetInference(device=device)     # Classifier
-labels = load_labels()                        # Class names (0–999)
+# Video source: cheapest camera mode that still covers the model input
+cam = open_source(sys.argv[1]) if len(sys.argv) > 1 else open_camera()
+sampler = FrameSampler(target_fps=runtime.target_fps)  # FPS controller
+gate = SceneChangeGate()                               # Skips static frames
+monitor = Monitor()                                    # Performance monitor
+model = load_variant(runtime.model, device)            # Classifier
+model_variant = runtime.model
+labels = load_labels()                                 # Class names (0–999)
+input_size = runtime.input_size
+
+
+# 🧯 Memory governor: degradation steps, mildest first (undone in reverse)
+def drop_caches():
+    release_memory()
+    if device == "cuda":
+        torch.cuda.empty_cache()
+
+
+def set_input_size(size):
+    global input_size
+    input_size = size
 
+
+def swap_model(variant):
+    global model, model_variant
+    # Free the old weights first: never hold both models at once
+    model = None
+    release_memory()
+    try:
+        model = load_variant(variant, device)
+    except Exception:
+        # Weights are local (prefetched / cached): restore the previous one
+        model = load_variant(model_variant, device)
+        raise
+    model_variant = variant
+
+
+def set_sample_rate(fps):
+    sampler.interval = 1.0 / fps if fps > 0 else 0
+
+
+# Never "lower" to a larger size; every-frame mode (0) drops to 5 FPS
+low_size = tuple(min(a, b) for a, b in zip(LOW_INPUT_SIZE, runtime.input_size))
+low_fps = runtime.target_fps / 2 if runtime.target_fps > 0 else 5
+
+
+governor = MemoryGovernor(budget_mb=MEMORY_BUDGET_MB, log_path="governor.jsonl")
+governor.add_step("drop caches", apply=drop_caches)
+governor.add_step("lower input resolution",
+                  apply=lambda: set_input_size(low_size),
+                  revert=lambda: set_input_size(runtime.input_size))
+# The int8 swap happens mid-run: fetch its weights now, while we can
+try:
+    prefetch_weights("int8")
+    governor.add_step("int8 model",
+                      apply=lambda: swap_model("int8"),
+                      revert=lambda: swap_model(runtime.model))
+except Exception as e:
+    print(f"[WARN] int8 weights unavailable ({e!r}); governor step 'int8 model' disabled")
+governor.add_step("halve sample rate",
+                  apply=lambda: set_sample_rate(low_fps),
+                  revert=lambda: set_sample_rate(runtime.target_fps))
+
+n = 0  # frame number (for the trace)
 try:
     while True:
+        n += 1
+
         #  Step 1: Read from webcam
-        frame = cam.read()
+        with tracer.span("capture", frame=n):
+            frame = cam.read()
         if frame is None:
             continue
 
         # Step 2: Throttle FPS
-        if not sampler.allow():
+        with tracer.span("sample", frame=n):
+            allowed = sampler.allow()
+        if not allowed:
             continue
+        tracer.step()  # one profiler step per processed frame
 
-        # Step 3: Preprocess for MobileNet
-        img = preprocess(frame)
+        # Step 3: Reuse last prediction if the scene hasn't changed
+        with tracer.span("scene_gate", frame=n):
+            changed = gate.should_infer(frame)
+        if changed:
+            # Preprocess for MobileNet
+            with tracer.span("preprocess", frame=n):
+                img = preprocess(frame, input_size)
 
-        #  Step 4: Predict class probabilities
-        probs = model.predict(img)
+            #  Step 4: Predict class probabilities
+            with tracer.span("inference", frame=n):
+                probs = model.predict(img)
+            gate.store(probs)
+        else:
+            probs = gate.last_result
 
         # 🏷 Step 5: Decode top-1 class
-        top = probs.argmax().item()
-        label = labels[top]
+        with tracer.span("postprocess", frame=n):
+            top = probs.argmax().item()
+            label = labels[top]
 
         # 📊 Step 6: Monitor performance
         fps, mem = monitor.update()
-        print(f"Prediction: {label} | FPS: {fps:.2f} | Mem: {mem:.2f} MB")
+        governor.check(fps)
+        print(f"Prediction: {label} | FPS: {fps:.2f} | Mem: {mem:.2f} MB | "
+              f"Inferred: {gate.inferred} Skipped: {gate.skipped} ({gate.skip_ratio():.0%})")
 
 except KeyboardInterrupt:
     cam.release()
@@ -0,0 +1,60 @@
+# main_async.py
+# Runs one MobileNet pipeline per camera on a single asyncio event loop.
+# Usage: python main_async.py [cam_id ...]   (default: camera 0)
+
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from camera.webcam import Webcam
+from camera.async_webcam import async_frames
+from pipeline.sampler import FrameSampler
+from pipeline.async_pipeline import async_predictions
+from inference.mobilenet import load_variant
+from app_utils.metrics import Monitor
+from app_utils.labels import load_labels
+from app_utils.runtime import RuntimeConfig
+import torch
+
+
+async def run_camera(cam_id, model, labels, executor, runtime):
+    cam = Webcam(cam_id)
+    sampler = FrameSampler(target_fps=runtime.target_fps)
+    monitor = Monitor()
+
+    frames = async_frames(cam, queue_size=runtime.queue_size, runtime=runtime)
+    async for probs in async_predictions(frames, sampler, model, executor, size=runtime.input_size):
+        label = labels[probs.argmax().item()]
+        fps, mem = monitor.update()
+        print(f"[cam {cam_id}] Prediction: {label} | FPS: {fps:.2f} | Mem: {mem:.2f} MB")
+
+
+async def main(cam_ids):
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    print(f"[INFO] Using device: {device}")
+
+    # ⚙️ Thread pools + pipeline settings per runtime.json (or defaults)
+    runtime = RuntimeConfig.load()
+    runtime.apply_libraries()
+    print(f"[INFO] Runtime: {runtime}")
+
+    # One model, one inference thread shared by every camera
+    model = load_variant(runtime.model, device)
+    labels = load_labels()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference",
+                                  initializer=runtime.enter,
+                                  initargs=("preprocess", "inference"))
+
+    try:
+        await asyncio.gather(*(run_camera(c, model, labels, executor, runtime) for c in cam_ids))
+    finally:
+        executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    cam_ids = [int(c) for c in sys.argv[1:]] or [0]
+    try:
+        asyncio.run(main(cam_ids))
+    except KeyboardInterrupt:
+        # asyncio.run cancels the pipelines; each one releases its camera
+        print("[INFO] Cameras stopped. Exiting.")
@@ -0,0 +1,91 @@
+# main_cascade.py
+# Cascade pipeline: MobileNet screens every sampled frame,
+# YOLOv5 only runs on frames that likely contain something relevant.
+#
+# Usage: python main_cascade.py [--classes "sports car" minivan ...]
+#                               [--top-k 5] [--threshold 0.1] [--low-res]
+
+import argparse
+
+from camera.webcam import Webcam
+from pipeline.sampler import FrameSampler
+from pipeline.cascade import CascadePipeline
+from inference.mobilenet import MobileNetInference
+from inference.yolo import YoloInference
+from app_utils.metrics import Monitor
+from app_utils.labels import load_labels
+import torch
+
+VEHICLES = ["ambulance", "cab", "jeep", "minivan", "moped", "motor scooter",
+            "mountain bike", "pickup", "police van", "school bus", "sports car",
+            "trailer truck"]
+
+parser = argparse.ArgumentParser(description="MobileNet -> YOLO cascade")
+parser.add_argument("--classes", nargs="+", default=VEHICLES,
+                    help="ImageNet class names that trigger the detector")
+parser.add_argument("--top-k", type=int, default=5)
+parser.add_argument("--threshold", type=float, default=0.10,
+                    help="min classifier probability for a class of interest")
+parser.add_argument("--det-threshold", type=float, default=0.25,
+                    help="min detector confidence")
+parser.add_argument("--low-res", action="store_true",
+                    help="run the classifier at 160x160 instead of 224x224")
+args = parser.parse_args()
+
+labels = load_labels()
+unknown = [c for c in args.classes if c not in labels]
+if unknown:
+    parser.error(f"unknown ImageNet classes: {unknown}")
+
+# 🧠 Detect Jetson GPU
+device = "cuda" if torch.cuda.is_available() else "cpu"
+print(f"[INFO] Using device: {device}")
+
+#  Initialize all modules
+cam = Webcam()                                # Live video source
+sampler = FrameSampler(target_fps=5)          # FPS controller
+monitor = Monitor()                           # Performance monitor
+cascade = CascadePipeline(
+    MobileNetInference(device=device),        # Stage 1: cheap classifier
+    YoloInference(device=device),             # Stage 2: detector
+    [labels.index(c) for c in args.classes],
+    top_k=args.top_k,
+    threshold=args.threshold,
+    det_threshold=args.det_threshold,
+    classifier_size=(160, 160) if args.low_res else (224, 224),
+)
+names = cascade.detector.model.names
+
+try:
+    while True:
+        #  Step 1: Read from webcam
+        frame = cam.read()
+        if frame is None:
+            continue
+
+        # Step 2: Throttle FPS
+        if not sampler.allow():
+            continue
+
+        # Step 3: Classifier, then detector if triggered
+        idx, p, dets = cascade.run(frame)
+
+        # 🏷 Step 4: Decode
+        if dets is None:
+            display_text = f"{labels[idx]} {p:.2f} (detector skipped)"
+        elif len(dets):
+            display_text = ", ".join(f"{names[int(d[5])]} {d[4]:.2f}" for d in dets)
+        else:
+            display_text = f"{labels[idx]} {p:.2f} (no detections)"
+
+        # 📊 Step 5: Monitor performance
+        fps, mem = monitor.update()
+        print(f"Prediction: {display_text} | FPS: {fps:.2f} | Mem: {mem:.2f} MB")
+        if monitor.count % 50 == 0:
+            print(f"  [{cascade.stage1}] [{cascade.stage2}]")
+
+except KeyboardInterrupt:
+    cam.release()
+    print(f"[INFO] {cascade.stage1}")
+    print(f"[INFO] {cascade.stage2}")
+    print("[INFO] Camera stopped. Exiting.")
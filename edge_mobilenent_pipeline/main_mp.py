@@ -0,0 +1,283 @@
+# main_mp.py
+# Multi-process MobileNet pipeline (no GIL contention between stages).
+#
+#   capture process                      inference process
+#   read -> sample -> resize/RGB  ──►  [ shared-memory ring ]  ──►  torch.from_numpy -> model
+#                 ▲   slot index via ready_q ────────────────────────┘       │
+#                 └──────────────────────── free slot index via free_q ◄─────┘
+#
+# The parent process only supervises: it stops both sides on Ctrl+C and
+# shuts everything down if either side crashes.
+#
+# Usage:
+#   python main_mp.py [--source 0] [--fps 5] [--slots 4]
+#   python main_mp.py --source synthetic:0 --fps 0 --compare 20   # throughput vs single process
+
+import argparse
+import multiprocessing as mp
+import os
+import queue
+import time
+
+import cv2
+import numpy as np
+
+from camera.sources import open_source
+from pipeline.sampler import FrameSampler
+from pipeline.preprocess import preprocess
+from pipeline.shm_ring import SharedFrameRing
+from inference.mobilenet import MobileNetInference
+from app_utils.metrics import Monitor
+from app_utils.labels import load_labels
+from app_utils.runtime import RuntimeConfig
+from app_utils.tracing import tracer, merge_traces
+import torch
+
+SIZE = (224, 224)
+SHAPE = (SIZE[1], SIZE[0], 3)
+
+
+def capture_worker(spec, target_fps, ring_name, slots, free_q, ready_q, stop, stats, runtime, block):
+    runtime.apply_libraries()
+    runtime.enter("capture", "preprocess")
+    tracer.enable_from_env(suffix="capture", dump_at_exit=False)
+    ring = SharedFrameRing(slots, SHAPE, name=ring_name)
+    cam = open_source(spec)
+    sampler = FrameSampler(target_fps=target_fps)
+    slot = None
+    try:
+        while not stop.is_set():
+            # Benchmark mode: wait for a free slot BEFORE reading, instead
+            # of spinning on (and dropping) frames the model can't take
+            if block and slot is None:
+                try:
+                    slot = free_q.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+            with tracer.span("capture"):
+                frame = cam.read()
+            if frame is None:
+                continue
+            with tracer.span("sample"):
+                allowed = sampler.allow()
+            if not allowed:
+                continue
+
+            # Live source: if the model is behind, drop the frame
+            # rather than queueing stale ones
+            if slot is None:
+                try:
+                    slot = free_q.get_nowait()
+                except queue.Empty:
+                    with stats.get_lock():
+                        stats[1] += 1
+                    continue
+
+            # Resize first, then BGR->RGB written straight into shared memory
+            with tracer.span("preprocess", slot=slot):
+                small = cv2.resize(frame, SIZE)
+                cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=ring.slot(slot))
+            ready_q.put((slot, time.time()))
+            slot = None
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ready_q.put(None)  # tell the consumer we're done
+        cam.release()
+        ring.close()
+        tracer.dump()
+
+
+def inference_worker(device, ring_name, slots, free_q, ready_q, stop, stats, quiet, runtime):
+    runtime.apply_libraries()
+    runtime.enter("inference")
+    tracer.enable_from_env(suffix="inference", dump_at_exit=False)
+    ring = SharedFrameRing(slots, SHAPE, name=ring_name)
+    model = MobileNetInference(device=device)
+    labels = load_labels()
+    monitor = Monitor()
+    try:
+        while not stop.is_set():
+            try:
+                with tracer.span("queue_wait"):
+                    item = ready_q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            slot, stamp = item
+            tracer.step()
+
+            # Zero-copy view of the slot; the uint8 -> float conversion
+            # is the only copy, after which the slot can be reused
+            with tracer.span("to_tensor", slot=slot):
+                x = torch.from_numpy(ring.slot(slot)).permute(2, 0, 1).unsqueeze(0).float().div_(255)
+            free_q.put(slot)
+
+            with tracer.span("inference", slot=slot):
+                probs = model.predict_tensor(x)
+            with stats.get_lock():
+                stats[0] += 1
+
+            if not quiet:
+                fps, mem = monitor.update()
+                latency = (time.time() - stamp) * 1000
+                print(f"Prediction: {labels[probs.argmax().item()]} | FPS: {fps:.2f} | "
+                      f"Latency: {latency:.1f} ms | Mem: {mem:.2f} MB")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ring.close()
+        tracer.dump()
+
+
+def run_multiprocess(spec, target_fps, slots, device, seconds=None, quiet=False, runtime=None,
+                     block=False):
+    """
+    Start capture + inference processes and supervise them.
+    block: capture waits for a free slot instead of dropping frames
+           (benchmarks: no busy-spinning capture stealing the model's CPU)
+    Returns inferred frames per second.
+    """
+    runtime = runtime or RuntimeConfig.load()
+    ring = SharedFrameRing(slots, SHAPE)
+    free_q, ready_q = mp.Queue(), mp.Queue()
+    for i in range(slots):
+        free_q.put(i)
+    stop = mp.Event()
+    stats = mp.Array("l", 2)  # [inferred, dropped]
+
+    procs = [
+        mp.Process(target=capture_worker, name="capture",
+                   args=(spec, target_fps, ring.name, slots, free_q, ready_q, stop, stats, runtime, block)),
+        mp.Process(target=inference_worker, name="inference",
+                   args=(device, ring.name, slots, free_q, ready_q, stop, stats, quiet, runtime)),
+    ]
+    for p in procs:
+        p.start()
+
+    start = time.time()
+    counted_from = None
+    try:
+        while True:
+            time.sleep(0.2)
+            # Crash detection: any child exiting on its own ends the run
+            dead = [p for p in procs if not p.is_alive()]
+            if dead:
+                for p in dead:
+                    if p.exitcode != 0:
+                        print(f"[ERROR] {p.name} process died (exit code {p.exitcode})")
+                break
+            # Don't count model load / warm-up
+            if counted_from is None and stats[0] > 0:
+                counted_from, base = time.time(), stats[0]
+            if seconds is not None and counted_from is not None and time.time() - counted_from >= seconds:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        for p in procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+        # Queues may still hold items; don't block exit on their feeder threads
+        for q in (free_q, ready_q):
+            q.cancel_join_thread()
+        ring.close()
+
+    # One timeline for both processes
+    trace = os.environ.get("EDGE_TRACE")
+    if trace:
+        root, ext = os.path.splitext(trace)
+        parts = [f"{root}.{name}{ext or '.json'}" for name in ("capture", "inference")]
+        merge_traces(parts, trace)
+        for p in parts:
+            if os.path.exists(p):
+                os.remove(p)
+        print(f"[INFO] Trace written to {trace}")
+
+    if counted_from is None:
+        return 0.0
+    print(f"[INFO] Dropped {stats[1]} frames (model busy) in {time.time() - start:.1f} s")
+    return (stats[0] - base) / (time.time() - counted_from)
+
+
+def run_single_process(spec, target_fps, device, seconds, runtime=None):
+    """
+    Reference: the plain main.py loop, for the throughput comparison.
+    Same thread pools / core placement as main.py (one thread, all stages).
+    """
+    runtime = runtime or RuntimeConfig.load()
+    runtime.apply_libraries()
+    runtime.enter("capture", "preprocess", "inference")
+    cam = open_source(spec)
+    sampler = FrameSampler(target_fps=target_fps)
+    model = MobileNetInference(device=device)
+    model.predict(np.zeros(SHAPE, dtype=np.uint8))  # warm-up
+    frames = 0
+    start = time.time()
+    try:
+        while time.time() - start < seconds:
+            frame = cam.read()
+            if frame is None or not sampler.allow():
+                continue
+            model.predict(preprocess(frame))
+            frames += 1
+    finally:
+        cam.release()
+    return frames / (time.time() - start)
+
+
+def _single_process_worker(result, *args):
+    result.put(run_single_process(*args))
+
+
+def run_single_process_isolated(spec, target_fps, device, seconds, runtime=None):
+    """
+    run_single_process() in a child process: thread pools and core pinning
+    are per process, and the multi-process workers forked afterwards must
+    not inherit this side's.
+    """
+    result = mp.Queue()
+    p = mp.Process(target=_single_process_worker, name="single-process",
+                   args=(result, spec, target_fps, device, seconds, runtime))
+    p.start()
+    try:
+        return result.get(timeout=seconds + 120)  # + model load and warm-up
+    except queue.Empty:
+        raise RuntimeError("Single-process reference produced no result") from None
+    finally:
+        p.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared-memory multi-process MobileNet pipeline")
+    parser.add_argument("--source", default="0", help="camera id, video file or 'synthetic[:fps]'")
+    parser.add_argument("--fps", type=float, default=5, help="target FPS (0 = every frame)")
+    parser.add_argument("--slots", type=int, default=4, help="shared-memory ring slots")
+    parser.add_argument("--compare", type=float, metavar="SECONDS",
+                        help="benchmark single- vs multi-process for SECONDS each and exit")
+    args = parser.parse_args()
+
+    # 🧠 Detect Jetson GPU
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    print(f"[INFO] Using device: {device}")
+
+    if args.compare:
+        # Both sides get the same RuntimeConfig thread + affinity settings,
+        # applied in their own processes: the parent stays untouched
+        runtime = RuntimeConfig.load()
+        single = run_single_process_isolated(args.source, args.fps, device, args.compare, runtime)
+        multi = run_multiprocess(args.source, args.fps, args.slots, device,
+                                 seconds=args.compare, quiet=True, runtime=runtime, block=True)
+        print(f"\n{'Mode':<16}{'Inferred FPS':>14}")
+        print(f"{'single-process':<16}{single:>14.2f}")
+        print(f"{'multi-process':<16}{multi:>14.2f}")
+        if single > 0:
+            print(f"Speed-up: {multi / single:.2f}x")
+    else:
+        run_multiprocess(args.source, args.fps, args.slots, device)
+        print("[INFO] Pipeline stopped. Exiting.")
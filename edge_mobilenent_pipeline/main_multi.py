@@ -0,0 +1,74 @@
+# main_multi.py
+# Multi-camera MobileNet pipeline: N sources, one shared model,
+# cross-camera batched inference.
+#
+# Usage:
+#   python main_multi.py --sources 0 1 2 3
+#   python main_multi.py --sources 0 clip.mp4 synthetic --fps 5 2 10 --max-batch 4
+
+import argparse
+
+from camera.sources import open_source
+from pipeline.multi_source import MultiSourceBatcher
+from inference.mobilenet import load_variant
+from app_utils.labels import load_labels
+from app_utils.runtime import RuntimeConfig
+from app_utils.tracing import tracer
+import psutil
+import torch
+
+
+parser = argparse.ArgumentParser(description="Multi-source MobileNet pipeline")
+parser.add_argument("--sources", nargs="+", default=["0"],
+                    help="camera ids, video files or 'synthetic'")
+parser.add_argument("--fps", nargs="+", type=float,
+                    help="target FPS per source (one value = same for all; default: runtime.json)")
+parser.add_argument("--max-batch", type=int, default=8,
+                    help="max frames per forward pass")
+args = parser.parse_args()
+
+# ⚙️ Readers pin to capture cores; this loop preprocesses + infers
+runtime = RuntimeConfig.load()
+if args.fps is None:
+    args.fps = [runtime.target_fps]
+if len(args.fps) == 1:
+    args.fps = args.fps * len(args.sources)
+if len(args.fps) != len(args.sources):
+    parser.error("--fps needs one value, or one per source")
+
+# 🧠 Detect Jetson GPU
+device = "cuda" if torch.cuda.is_available() else "cpu"
+print(f"[INFO] Using device: {device}")
+
+runtime.apply_libraries()
+runtime.enter("preprocess", "inference")
+print(f"[INFO] Runtime: {runtime}")
+
+# 🔍 Opt-in timeline: EDGE_TRACE=trace.json python main_multi.py ...
+if tracer.enable_from_env():
+    print(f"[INFO] Tracing to {tracer.path}")
+
+#  One model for every source
+model = load_variant(runtime.model, device)
+labels = load_labels()
+batcher = MultiSourceBatcher(model, max_batch=args.max_batch, runtime=runtime, size=runtime.input_size)
+
+for i, (spec, fps) in enumerate(zip(args.sources, args.fps)):
+    batcher.add_source(f"src{i}:{spec}", open_source(spec), target_fps=fps)
+
+try:
+    while True:
+        results = batcher.step()
+        if not results:
+            continue
+
+        mem = psutil.Process().memory_info().rss / (1024 ** 2)
+        for name, probs, fps, latency_ms in results:
+            label = labels[probs.argmax().item()]
+            print(f"[{name}] Prediction: {label} | FPS: {fps:.2f} | "
+                  f"Latency: {latency_ms:.1f} ms | Batch: {len(results)} | Mem: {mem:.2f} MB")
+
+except KeyboardInterrupt:
+    batcher.close()
+    print(f"[INFO] Avg batch size: {batcher.avg_batch_size():.2f}")
+    print("[INFO] Sources stopped. Exiting.")
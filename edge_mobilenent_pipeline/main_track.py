@@ -0,0 +1,56 @@
+# main_track.py
+# Live YOLOv5 pipeline in detect-then-track mode:
+# the detector runs every DETECT_EVERY frames (or when tracking gets
+# unreliable), optical flow moves the boxes in between.
+
+from camera.webcam import Webcam
+from pipeline.sampler import FrameSampler
+from pipeline.preprocess import preprocess
+from inference.yolo import YoloInference
+from inference.tracker import TrackingDetector
+from app_utils.metrics import Monitor
+import torch
+
+DETECT_EVERY = 5        # detector call at least every N frames
+MIN_TRACK_CONF = 0.5    # re-detect early below this tracking confidence
+
+# 🧠 Detect Jetson GPU
+device = "cuda" if torch.cuda.is_available() else "cpu"
+print(f"[INFO] Using device: {device}")
+
+#  Initialize all modules
+cam = Webcam()                                # Live video source
+sampler = FrameSampler(target_fps=15)         # Tracking is cheap: higher output rate
+monitor = Monitor()                           # Performance monitor
+model = YoloInference(device=device)          # YOLOv5 Detector
+tracker = TrackingDetector(model, preprocess, DETECT_EVERY, MIN_TRACK_CONF)
+names = model.model.names                     # class id -> name
+
+try:
+    while True:
+        #  Step 1: Read from webcam
+        frame = cam.read()
+        if frame is None:
+            continue
+
+        # Step 2: Throttle FPS
+        if not sampler.allow():
+            continue
+
+        # Step 3: Detect or track (boxes are in raw frame pixels)
+        tracks = tracker.step(frame)
+
+        # 🏷 Step 4: Decode tracks
+        if tracks:
+            display_text = ", ".join(f"#{t.id} {names[t.cls]}" for t in tracks)
+        else:
+            display_text = "No objects"
+
+        # 📊 Step 5: Monitor performance
+        fps, mem = monitor.update()
+        det_rate = fps * tracker.detector_calls / tracker.frames
+        print(f"Tracks: {display_text} | FPS: {fps:.2f} | Detector/s: {det_rate:.2f} | Mem: {mem:.2f} MB")
+
+except KeyboardInterrupt:
+    cam.release()
+    print("[INFO] Camera stopped. Exiting.")
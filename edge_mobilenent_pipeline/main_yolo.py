@@ -4,6 +4,7 @@
 from camera.webcam import Webcam
 from pipeline.sampler import FrameSampler
 from pipeline.preprocess import preprocess
+from pipeline.scene_gate import SceneChangeGate
 from inference.yolo import YoloInference
 from app_utils.metrics import Monitor
 import torch
@@ -15,6 +16,7 @@ print(f"[INFO] Using device: {device}")
 #  Initialize all modules
 cam = Webcam()                                # Live video source
 sampler = FrameSampler(target_fps=5)          # FPS controller
+gate = SceneChangeGate()                      # Skips static frames
 monitor = Monitor()                           # Performance monitor
 model = YoloInference(device=device)          # YOLOv5 Classifier/Detector
 
@@ -29,13 +31,18 @@ try:
         if not sampler.allow():
             continue
 
-        # Step 3: Preprocess for YOLO
-        # Note: preprocess() resizes to 224x224 which is small for YOLO,
-        # but we maintain pipeline consistency.
-        img = preprocess(frame)
+        # Step 3: Reuse last detections if the scene hasn't changed
+        if gate.should_infer(frame):
+            # Preprocess for YOLO
+            # Note: preprocess() resizes to 224x224 which is small for YOLO,
+            # but we maintain pipeline consistency.
+            img = preprocess(frame)
 
-        #  Step 4: Predict (Object Detection)
-        results = model.predict(img)
+            #  Step 4: Predict (Object Detection)
+            results = model.predict(img)
+            gate.store(results)
+        else:
+            results = gate.last_result
 
         # 🏷 Step 5: Decode results
         # results.xyxy[0] contains tensor with [x1, y1, x2, y2, conf, cls]
@@ -63,7 +70,8 @@ try:
 
         # 📊 Step 6: Monitor performance
         fps, mem = monitor.update()
-        print(f"Prediction: {display_text} | FPS: {fps:.2f} | Mem: {mem:.2f} MB")
+        print(f"Prediction: {display_text} | FPS: {fps:.2f} | Mem: {mem:.2f} MB | "
+              f"Inferred: {gate.inferred} Skipped: {gate.skipped} ({gate.skip_ratio():.0%})")
 
 except KeyboardInterrupt:
     cam.release()
@@ -0,0 +1,38 @@
+# pipeline/async_pipeline.py
+# Responsibility: asyncio version of the main.py loop
+# (frames -> sampler -> preprocess -> predict) as an async iterator,
+# so several pipelines can share one process and one event loop.
+
+import asyncio
+
+from pipeline.preprocess import preprocess
+
+
+def _infer(model, frame, size):
+    # Runs in the inference executor: preprocess + forward pass
+    return model.predict(preprocess(frame, size))
+
+
+async def async_predictions(frames, sampler, model, executor=None, size=(224, 224)):
+    """
+    frames:   async iterator of BGR frames (e.g. camera.async_webcam.async_frames)
+    sampler:  FrameSampler deciding which frames reach the model
+    model:    object with predict(image) (MobileNetInference, YoloInference)
+    executor: where preprocess + predict run. Pass a shared single-worker
+              executor when several pipelines share one model.
+    size:     model input (width, height)
+
+    Yields the raw model output for every sampled frame.
+    Closing this iterator closes `frames` (which releases the camera).
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        async for frame in frames:
+            # Cheap, stays on the loop
+            if not sampler.allow():
+                continue
+            # One result in flight per pipeline: the frame queue upstream
+            # fills up and applies backpressure while we wait here
+            yield await loop.run_in_executor(executor, _infer, model, frame, size)
+    finally:
+        await frames.aclose()
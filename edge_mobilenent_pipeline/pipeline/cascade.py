@@ -0,0 +1,96 @@
+# pipeline/cascade.py
+# Responsibility: Two-stage cascade.
+# Stage 1: cheap classifier (MobileNet, optionally at lower resolution)
+#          runs on every sampled frame.
+# Stage 2: expensive detector (YOLO) runs only when stage 1 thinks
+#          a class of interest is in the frame.
+
+import time
+
+import torch
+
+from pipeline.preprocess import preprocess
+
+
+class StageStats:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.hits = 0          # calls that passed this stage
+        self.total_time = 0.0  # seconds
+
+    def record(self, seconds, hit):
+        self.calls += 1
+        self.hits += bool(hit)
+        self.total_time += seconds
+
+    def hit_rate(self):
+        return self.hits / self.calls if self.calls else 0.0
+
+    def avg_latency_ms(self):
+        return self.total_time / self.calls * 1000 if self.calls else 0.0
+
+    def __str__(self):
+        return (f"{self.name}: {self.calls} calls | hit rate {self.hit_rate():.0%} | "
+                f"{self.avg_latency_ms():.1f} ms avg")
+
+
+class CascadePipeline:
+    def __init__(self, classifier, detector, classes_of_interest,
+                 top_k=5, threshold=0.10, det_threshold=0.25,
+                 classifier_size=(224, 224), detector_size=(224, 224)):
+        """
+        classifier:          MobileNetInference (or any predict(img) -> probs)
+        detector:            YoloInference (needs detect(img) -> (N, 6))
+        classes_of_interest: classifier class indices that trigger stage 2
+        top_k:               look for classes of interest in the top-k
+        threshold:           ...with at least this probability
+        det_threshold:       keep detections above this confidence
+        classifier_size:     stage 1 input size, e.g. (160, 160) to make it cheaper
+        detector_size:       stage 2 input size
+        """
+        self.classifier = classifier
+        self.detector = detector
+        self.classes = set(int(c) for c in classes_of_interest)
+        self.top_k = top_k
+        self.threshold = threshold
+        self.det_threshold = det_threshold
+        self.classifier_size = classifier_size
+        self.detector_size = detector_size
+
+        self.stage1 = StageStats("classifier")
+        self.stage2 = StageStats("detector")
+
+    def gate(self, probs):
+        """
+        Returns (triggered, class_index, prob) for the best class of
+        interest found in the top-k, or (False, top1, p_top1).
+        """
+        values, indices = torch.topk(probs.flatten(), self.top_k)
+        for p, idx in zip(values.tolist(), indices.tolist()):
+            if idx in self.classes and p >= self.threshold:
+                return True, idx, p
+        return False, indices[0].item(), values[0].item()
+
+    def run(self, frame):
+        """
+        Process one BGR frame.
+
+        Returns (class_index, prob, detections):
+        - class_index, prob: stage 1 answer (class of interest if triggered)
+        - detections: (N, 6) numpy array from stage 2, or None if
+          stage 2 was skipped
+        """
+        start = time.time()
+        probs = self.classifier.predict(preprocess(frame, self.classifier_size))
+        triggered, idx, p = self.gate(probs)
+        self.stage1.record(time.time() - start, triggered)
+
+        if not triggered:
+            return idx, p, None
+
+        start = time.time()
+        dets = self.detector.detect(preprocess(frame, self.detector_size))
+        dets = dets[dets[:, 4] >= self.det_threshold]
+        self.stage2.record(time.time() - start, len(dets) > 0)
+        return idx, p, dets
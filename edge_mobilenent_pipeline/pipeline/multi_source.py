@@ -0,0 +1,153 @@
+# pipeline/multi_source.py
+# Responsibility: Feed N frame sources into ONE shared model.
+# - Each source is read on its own thread (only the newest frame is kept)
+# - Each source has its own FrameSampler rate
+# - Sampled frames from all sources are batched into one forward pass
+# - Results are routed back to their source, with per-source metrics
+
+import threading
+import time
+
+from pipeline.sampler import FrameSampler
+from pipeline.preprocess import preprocess
+from app_utils.metrics import Monitor
+from app_utils.tracing import tracer
+
+
+class LatestFrameReader:
+    def __init__(self, source, runtime=None, name=""):
+        """
+        Reads `source` continuously on a background thread and keeps only
+        the most recent frame. Slow consumers therefore always get a
+        fresh frame instead of a backlog of stale ones.
+
+        runtime: optional RuntimeConfig; the thread pins itself to the
+                 "capture" cores
+        """
+        self.source = source
+        self.runtime = runtime
+        self.name = name
+        self.lock = threading.Lock()
+        self.frame = None
+        self.stamp = 0.0   # capture time of self.frame
+        self.seq = 0       # increments on every new frame
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        if self.runtime is not None:
+            self.runtime.enter("capture")
+        while self.running:
+            with tracer.span("capture", source=self.name):
+                frame = self.source.read()
+            if frame is None:
+                time.sleep(0.01)  # camera hiccup / end of file
+                continue
+            now = time.time()
+            with self.lock:
+                self.frame = frame
+                self.stamp = now
+                self.seq += 1
+
+    def latest(self):
+        """Returns (seq, frame, capture_time) of the newest frame."""
+        with self.lock:
+            return self.seq, self.frame, self.stamp
+
+    def stop(self):
+        self.running = False
+        self.thread.join(timeout=1.0)
+        self.source.release()
+
+
+class _SourceState:
+    def __init__(self, name, source, target_fps, runtime=None):
+        self.name = name
+        self.reader = LatestFrameReader(source, runtime, name)
+        self.sampler = FrameSampler(target_fps=target_fps)
+        self.monitor = Monitor()
+        self.last_seq = 0      # newest frame already sent to the model
+        self.latency = 0.0     # capture -> result, seconds (last frame)
+
+
+class MultiSourceBatcher:
+    def __init__(self, model, max_batch=8, runtime=None, size=(224, 224)):
+        """
+        model:     object with predict_batch(list_of_images) -> (N, ...) tensor
+        max_batch: upper bound on frames per forward pass
+        runtime:   optional RuntimeConfig used to pin the reader threads
+        size:      model input (width, height)
+        """
+        self.model = model
+        self.max_batch = max_batch
+        self.size = size
+        self.runtime = runtime
+        self.sources = []
+        self.start = 0          # round-robin start position (fairness)
+        self.batches = 0
+        self.batched_frames = 0
+
+    def add_source(self, name, source, target_fps=5):
+        self.sources.append(_SourceState(name, source, target_fps, self.runtime))
+
+    def step(self):
+        """
+        Run one inference tick.
+
+        Walks the sources round-robin, starting one place further each
+        tick, so that when more sources are due than max_batch allows
+        every source still gets its turn.
+
+        Returns a list of (name, probs, fps, latency_ms), one per frame
+        in the batch. Empty list if no source had a frame due.
+        """
+        n = len(self.sources)
+        picked = []
+        frames = []
+        last = None
+
+        for i in range(n):
+            if len(frames) >= self.max_batch:
+                break
+            idx = (self.start + i) % n
+            state = self.sources[idx]
+
+            seq, frame, stamp = state.reader.latest()
+            # Only new frames, and only at this source's own rate
+            if seq == state.last_seq or not state.sampler.allow():
+                continue
+
+            state.last_seq = seq
+            picked.append((state, stamp))
+            with tracer.span("preprocess", source=state.name):
+                frames.append(preprocess(frame, self.size))
+            last = idx
+
+        if not frames:
+            time.sleep(0.002)  # nothing due yet, don't spin
+            return []
+
+        # Next tick begins right after the last source served
+        self.start = (last + 1) % n
+
+        tracer.step()  # one batch = one frame of the torch profiler window
+        with tracer.span("inference", batch=len(frames)):
+            probs = self.model.predict_batch(frames)
+        self.batches += 1
+        self.batched_frames += len(frames)
+
+        now = time.time()
+        results = []
+        for (state, stamp), p in zip(picked, probs):
+            fps, _ = state.monitor.update()
+            state.latency = now - stamp
+            results.append((state.name, p, fps, state.latency * 1000))
+        return results
+
+    def avg_batch_size(self):
+        return self.batched_frames / self.batches if self.batches else 0.0
+
+    def close(self):
+        for state in self.sources:
+            state.reader.stop()
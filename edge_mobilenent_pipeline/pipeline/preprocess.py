@@ -5,16 +5,18 @@
 
 import cv2
 
-def preprocess(frame):
+def preprocess(frame, size=(224, 224)):
     """
     Takes a BGR frame from OpenCV, converts to RGB,
     resizes to 224x224 (standard for MobileNet input),
     and returns the processed image.
+
+    size: (width, height) override, e.g. (160, 160) for a cheaper pass
     """
     # Convert BGR to RGB (MobileNet expects RGB ordering)
     frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
     # Resize to 224x224 (what MobileNet expects)
-    frame = cv2.resize(frame, (224, 224))
+    frame = cv2.resize(frame, size)
 
     return frame
@@ -9,7 +9,7 @@ class FrameSampler:
         Drops frames to ensure real-time performance.
         Example: If target_fps = 5, allow 1 frame every 0.2 seconds.
         """
-        self.interval = 1.0 / target_fps
+        self.interval = 1.0 / target_fps if target_fps > 0 else 0  # 0 = allow every frame
         self.last = 0  # timestamp of last allowed frame
 
     def allow(self):
@@ -0,0 +1,63 @@
+# pipeline/scene_gate.py
+# Responsibility: Skip inference on frames where nothing has changed.
+# Compares a tiny grayscale thumbnail of each frame against the last
+# frame that went through the model; if the difference is small, the
+# previous prediction is reused.
+
+import cv2
+import numpy as np
+
+
+class SceneChangeGate:
+    def __init__(self, threshold=6.0, max_skip=25, size=(32, 32)):
+        """
+        threshold: mean absolute difference (0-255 gray levels) between
+                   thumbnails above which the scene counts as changed
+        max_skip:  force a real inference after this many reused
+                   predictions in a row (0 = never force)
+        size:      thumbnail size; 32x32 costs a few microseconds
+        """
+        self.threshold = threshold
+        self.max_skip = max_skip
+        self.size = size
+
+        self.reference = None    # thumbnail of last inferred frame
+        self.last_result = None  # prediction for that frame
+        self.streak = 0          # reused predictions since last inference
+
+        # Counters
+        self.inferred = 0
+        self.skipped = 0
+
+    def _thumbnail(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        # INTER_AREA averages pixels, which also suppresses sensor noise
+        return cv2.resize(gray, self.size, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def should_infer(self, frame):
+        """
+        Returns True if `frame` must go through the model.
+        Returns False if gate.last_result can be reused.
+        """
+        thumb = self._thumbnail(frame)
+
+        if (self.reference is None
+                or self.last_result is None
+                or (self.max_skip and self.streak >= self.max_skip)
+                or np.abs(thumb - self.reference).mean() > self.threshold):
+            self.reference = thumb
+            self.streak = 0
+            self.inferred += 1
+            return True
+
+        self.streak += 1
+        self.skipped += 1
+        return False
+
+    def store(self, result):
+        """Remember the prediction for the frame that was just inferred."""
+        self.last_result = result
+
+    def skip_ratio(self):
+        total = self.inferred + self.skipped
+        return self.skipped / total if total else 0.0
@@ -0,0 +1,43 @@
+# pipeline/shm_ring.py
+# Responsibility: Fixed-size ring of frame slots in shared memory.
+# Processes exchange slot INDICES through queues; the pixels themselves
+# are never pickled or copied between processes.
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedFrameRing:
+    def __init__(self, slots, shape, dtype=np.uint8, name=None):
+        """
+        slots: number of frames the ring can hold
+        shape: shape of one frame, e.g. (224, 224, 3)
+        name:  None  -> create a new segment (owner, unlinks on close)
+               "xyz" -> attach to an existing segment (other process)
+        """
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+
+        size = slots * int(np.prod(self.shape)) * self.dtype.itemsize
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+
+        # One big view; slot(i) is a view into it (no copy)
+        self.array = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=self.shm.buf)
+
+    def slot(self, i):
+        """Writable np.ndarray view of slot i (valid until close())."""
+        return self.array[i]
+
+    def close(self):
+        # Every view must be gone before the mapping can be closed
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,47 @@
+# probe_camera.py
+# List the capture modes a camera really grants (format, size, buffer),
+# with capture-to-frame latency and achieved FPS for each, and show the
+# mode Webcam.negotiate() would pick. --save stores that mode in
+# runtime.json, where main.py picks it up instead of probing at startup.
+#
+# Usage: python probe_camera.py [--cam 0] [--min-size 224 224] [--min-fps 15] [--save]
+#        (--cam also accepts a /dev/videoN path or a video file)
+
+import argparse
+
+from camera.webcam import Webcam
+from app_utils.runtime import RuntimeConfig
+
+parser = argparse.ArgumentParser(description="Probe webcam capture modes")
+parser.add_argument("--cam", default="0")
+parser.add_argument("--min-size", nargs=2, type=int, default=[224, 224], metavar=("W", "H"))
+parser.add_argument("--min-fps", type=float, default=15)
+parser.add_argument("--frames", type=int, default=20, help="frames measured per mode")
+parser.add_argument("--save", nargs="?", const="runtime.json", metavar="PATH",
+                    help="store the selected mode in runtime.json (or PATH)")
+args = parser.parse_args()
+
+cam_id = int(args.cam) if args.cam.isdigit() else args.cam
+report = []
+cam = Webcam.negotiate(cam_id, tuple(args.min_size), min_fps=args.min_fps,
+                       frames=args.frames, report=report)
+
+print(f"{'Requested':<18}{'Granted':<18}{'Latency ms':>12}{'FPS':>8}")
+for r in report:
+    req = "{} {}x{}".format(*r["requested"])
+    got = "{} {}x{}".format(*r["granted"])
+    latency = f"{r['latency_ms']:.2f}" if r["latency_ms"] is not None else "-"
+    print(f"{req:<18}{got:<18}{latency:>12}{r['fps']:>8.1f}")
+
+g = cam.granted
+print(f"\n[INFO] Selected: {g['fourcc']} {g['width']}x{g['height']} @ {g['fps']:.0f} FPS, "
+      f"driver buffer {g['buffer_size']}")
+for key, (wanted, got) in cam.mismatches().items():
+    print(f"[WARN] {key}: requested {wanted}, driver granted {got}")
+cam.release()
+
+if args.save:
+    runtime = RuntimeConfig.load(args.save)
+    runtime.camera = cam.mode()
+    runtime.save(args.save)
+    print(f"[INFO] Saved camera mode to {args.save}")
@@ -0,0 +1,34 @@
+# record.py
+# Record frames (with timestamps) from any source to a .rec file,
+# for deterministic replay later (python main.py clip.rec).
+#
+# Usage: python record.py clip.rec [--source 0] [--seconds 30] [--lossless]
+
+import argparse
+import time
+
+from camera.sources import open_source, FrameRecorder
+
+parser = argparse.ArgumentParser(description="Record a frame source to a .rec file")
+parser.add_argument("output", help="output .rec file")
+parser.add_argument("--source", default="0", help="camera id, video file or 'synthetic'")
+parser.add_argument("--seconds", type=float, default=30)
+parser.add_argument("--quality", type=int, default=90, help="JPEG quality")
+parser.add_argument("--lossless", action="store_true", help="store PNG instead of JPEG")
+args = parser.parse_args()
+
+cam = open_source(args.source)
+recorder = FrameRecorder(args.output, quality=args.quality, lossless=args.lossless)
+start = time.time()
+try:
+    while time.time() - start < args.seconds:
+        frame = cam.read()
+        if frame is None:
+            continue
+        recorder.write(frame)
+except KeyboardInterrupt:
+    pass
+finally:
+    cam.release()
+    recorder.close()
+    print(f"[INFO] Recorded {recorder.frames} frames in {time.time() - start:.1f} s to {args.output}")
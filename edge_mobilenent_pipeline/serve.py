@@ -0,0 +1,32 @@
+# serve.py
+# Local MobileNet inference daemon with dynamic batching.
+# Load the model once; every pipeline on the box connects with
+# inference.client.InferenceClient instead of loading its own copy.
+#
+# Usage: python serve.py [--socket /tmp/mobilenet.sock] [--max-batch 8] [--max-delay-ms 5]
+
+import argparse
+
+from inference.mobilenet import MobileNetInference
+from inference.server import InferenceServer
+import torch
+
+parser = argparse.ArgumentParser(description="Local dynamic-batching inference server")
+parser.add_argument("--socket", default="/tmp/mobilenet.sock")
+parser.add_argument("--max-batch", type=int, default=8)
+parser.add_argument("--max-delay-ms", type=float, default=5.0)
+parser.add_argument("--report-every", type=float, default=10.0,
+                    help="seconds between stats lines (0 = off)")
+args = parser.parse_args()
+
+# 🧠 Detect Jetson GPU
+device = "cuda" if torch.cuda.is_available() else "cpu"
+print(f"[INFO] Using device: {device}")
+
+server = InferenceServer(MobileNetInference(device=device), args.socket,
+                         max_batch=args.max_batch, max_delay_ms=args.max_delay_ms)
+try:
+    server.serve_forever(report_every=args.report_every)
+except KeyboardInterrupt:
+    print(f"[STATS] {server.stats.report()}")
+    print("[INFO] Server stopped. Exiting.")